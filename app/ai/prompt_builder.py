@@ -1,21 +1,82 @@
 from __future__ import annotations
 
-from app.models import Facility, FacilityConfig
+import json
+from typing import TYPE_CHECKING, Sequence
 
+import pytz
 
-def build_system_prompt(facility: Facility, config: FacilityConfig) -> str:
+from app.telephony.caller import BookingSummary, CallerContext
+
+if TYPE_CHECKING:
+    # Annotations only: importing the models would create the database engine.
+    from app.models import Court, Facility, FacilityConfig
+
+# Identical for every facility and sent first, so the Realtime API can reuse
+# its cached prefix; keep anything facility-specific out of it.
+STATIC_INSTRUCTIONS = """
+You are an AI phone receptionist for a badminton center in India.
+
+Your job is to answer calls, help callers book badminton courts, and answer simple questions.
+Confirm the caller's name (unless already known), phone number, date, and time before booking.
+Once the caller picks a slot, hold it with the hold_slot tool while you confirm their details, then pass the hold_id to create_booking.
+Use the provided tools to check availability and create bookings. Tell the caller you are checking before a lookup rather than going silent.
+When the requested time is full or the caller is flexible, use find_next_available once instead of checking day by day.
+Quote the price the tools return with each slot or booking rather than working it out from the pricing rules.
+For regular sessions (coaching batches, groups) use create_recurring_booking: check with dry_run first, tell the caller which dates clash, then book.
+If you cannot handle a request, let the caller know a human will call back.
+""".strip()
+
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def build_facility_context(facility: Facility, config: FacilityConfig, courts: Sequence[Court] = ()) -> str:
     open_hours_summary = ", ".join(
         f"{day}: {', '.join(ranges)}" for day, ranges in (config.open_hours or {}).items()
     )
-    prompt = f"""
-You are an AI phone receptionist for a badminton center in India.
-Facility name: {facility.name}.
-Timezone: {facility.timezone}.
-Operating hours: {open_hours_summary}.
-Slot length: {config.slot_minutes} minutes.
+    lines = [
+        f"Facility name: {facility.name}.",
+        f"Timezone: {facility.timezone}.",
+        f"Operating hours: {open_hours_summary}.",
+        f"Slot length: {config.slot_minutes} minutes.",
+        f"Courts: {config.max_courts}.",
+    ]
+    if courts:
+        lines.append(f"Court names: {', '.join(court.name for court in courts[: config.max_courts])}.")
+    if config.pricing_rules:
+        lines.append(f"Pricing rules: {json.dumps(config.pricing_rules, sort_keys=True)}.")
+    return "\n".join(lines)
 
-Your job is to answer calls, help callers book badminton courts, and answer simple questions.
-Always confirm caller name, phone number, date, and time before booking.
-Use the provided tools to check availability and create bookings. If you cannot handle a request, let the caller know a human will call back.
-"""
-    return prompt.strip()
+
+def build_system_prompt(facility: Facility, config: FacilityConfig, courts: Sequence[Court] = ()) -> str:
+    return f"{STATIC_INSTRUCTIONS}\n\n{build_facility_context(facility, config, courts)}"
+
+
+def _describe_booking(booking: BookingSummary, tz) -> str:
+    start = booking.start.astimezone(tz)
+    text = f"{start:%a %d %b %H:%M}-{booking.end.astimezone(tz):%H:%M}"
+    return f"{text} ({booking.court})" if booking.court else text
+
+
+def build_caller_context(caller: CallerContext, timezone: str) -> str:
+    """Per-call context, sent after the cached facility prompt so that prefix stays shared."""
+    tz = pytz.timezone(timezone)
+    lines = [f"Caller phone number: {caller.phone}. Use it for bookings unless the caller gives another."]
+    if not caller.known:
+        lines.append("This is a new caller.")
+        return "\n".join(lines)
+    if caller.name:
+        lines.append(f"Returning customer: {caller.name}. Greet them by name; no need to ask for it again.")
+    else:
+        lines.append("Returning customer; their name is not on file.")
+    if caller.upcoming:
+        lines.append(f"Upcoming bookings: {'; '.join(_describe_booking(b, tz) for b in caller.upcoming)}.")
+    usual = caller.usual_slot(timezone)
+    if usual:
+        weekday, start, count = usual
+        lines.append(
+            f"Usual slot: {WEEKDAY_NAMES[weekday]} {start:%H:%M} ({count} of their last {len(caller.recent)} bookings). "
+            "If they want to book, offer it first."
+        )
+    elif caller.recent:
+        lines.append(f"Last booking: {_describe_booking(caller.recent[0], tz)}.")
+    return "\n".join(lines)
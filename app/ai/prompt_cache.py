@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+from app.ai.prompt_builder import build_system_prompt
+from app.ai.tools import TOOL_SCHEMAS
+from app.config import get_settings
+from app.models import Court, Facility, FacilityConfig
+from app.utils import codec
+from app.utils.cache import CacheStats, TTLCache
+
+settings = get_settings()
+
+
+# The tool registration never changes at runtime: serialise it once.
+TOOL_REGISTRATION: bytes = codec.dumps_bytes({"type": "register_tools", "tools": TOOL_SCHEMAS})
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    config_updated_at: datetime
+    facility: Facility
+    text: str
+    message: bytes  # the ready-to-send system event
+
+
+_prompt_cache: TTLCache[CompiledPrompt] = TTLCache(
+    maxsize=settings.facility_cache_max_entries,
+    ttl_seconds=settings.facility_cache_ttl_seconds,
+)
+
+
+def compiled_prompt(facility: Facility, config: FacilityConfig, courts: Sequence[Court] = ()) -> CompiledPrompt:
+    """Return the facility's system event, building it only when its inputs changed.
+
+    An entry is reused while ``config.updated_at`` is unchanged and the
+    facility object is the one the facility cache still serves, so edits
+    that go through ``invalidate_facility_cache`` are picked up on the next
+    call without a separate invalidation step.
+    """
+    cached = _prompt_cache.get(facility.id)
+    if cached is not None:
+        if cached.config_updated_at == config.updated_at and cached.facility is facility:
+            return cached
+        _prompt_cache.invalidate(facility.id)
+    text = build_system_prompt(facility, config, courts)
+    prompt = CompiledPrompt(
+        config_updated_at=config.updated_at,
+        facility=facility,
+        text=text,
+        message=codec.dumps_bytes({"type": "system", "content": text}),
+    )
+    _prompt_cache.set(facility.id, prompt)
+    return prompt
+
+
+def invalidate_prompt_cache(facility_id: Optional[UUID] = None) -> None:
+    if facility_id is None:
+        _prompt_cache.clear()
+    else:
+        _prompt_cache.invalidate(facility_id)
+
+
+def prompt_cache_stats() -> CacheStats:
+    return _prompt_cache.stats
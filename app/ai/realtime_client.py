@@ -1,27 +1,77 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from datetime import datetime
-from typing import Any, Callable, Dict
+import base64
+import logging
+import time
+from datetime import date, datetime, time as clock_time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set
+from uuid import UUID
 
-import websockets
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import metrics
 from app.ai import tools
-from app.ai.prompt_builder import build_system_prompt
+from app.ai.prompt_builder import build_caller_context
+from app.ai.prompt_cache import compiled_prompt
+from app.ai.realtime_pool import realtime_pool
 from app.config import get_settings
 from app.db import SessionLocal
-from app.models import Facility, FacilityConfig
+from app.models import Court, Facility, FacilityConfig
+from app.telephony.call_log import CallRecorder
+from app.telephony.caller import CallerContext
+from app.utils import codec
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Seconds a tool may run before the model is told it timed out.
+TOOL_TIMEOUTS: Dict[str, float] = {
+    "check_availability": 8.0,
+    "find_next_available": 8.0,
+    "hold_slot": 5.0,
+    "create_booking": 15.0,
+    "create_recurring_booking": 20.0,
+}
+DEFAULT_TOOL_TIMEOUT = 10.0
+# Tools that commit: a timeout or hang-up only stops waiting for them, never cancels the write.
+WRITE_TOOLS = frozenset({"create_booking", "create_recurring_booking"})
+# Shielded writes still running after their caller stopped waiting; the loop only holds weak references.
+_background_writes: Set[asyncio.Task] = set()
+
+AudioHandler = Callable[[bytes], Awaitable[None]]
+EventHandler = Callable[[], Awaitable[None]]
+
 
 class RealtimeClient:
-    def __init__(self, facility: Facility, config: FacilityConfig):
+    def __init__(
+        self,
+        facility: Facility,
+        config: FacilityConfig,
+        on_audio: Optional[AudioHandler] = None,
+        on_speech_started: Optional[EventHandler] = None,
+        on_audio_done: Optional[EventHandler] = None,
+        courts: Sequence[Court] = (),
+        recorder: Optional[CallRecorder] = None,
+        timing: Optional[metrics.CallTiming] = None,
+    ):
         self.facility = facility
         self.config = config
+        self.courts = courts
+        self.on_audio = on_audio
+        self.on_speech_started = on_speech_started
+        self.on_audio_done = on_audio_done
+        self.recorder = recorder
+        self.timing = timing
+        self.caller: Optional[CallerContext] = None
         self.ws = None
-        self.session = SessionLocal()
+        self._speech_stopped_at: Optional[float] = None
+        # Set on barge-in: audio still arriving belongs to the interrupted response
+        # and is dropped until the next response starts.
+        self._interrupted = False
+        # Tool calls run as tasks so listen() keeps draining audio.
+        self._tool_tasks: Set[asyncio.Task] = set()
+        self._last_delivery: Optional[asyncio.Task] = None
 
     async def __aenter__(self):
         await self.connect()
@@ -29,78 +79,216 @@ class RealtimeClient:
 
     async def __aexit__(self, exc_type, exc, tb):
         await self.close()
-        await self.session.close()
 
-    async def connect(self) -> None:
-        headers = {"Authorization": f"Bearer {settings.openai_api_key}"}
-        self.ws = await websockets.connect("wss://api.openai.com/v1/realtime", extra_headers=headers)
+    async def connect(self, caller_lookup: Optional[Awaitable[Optional[CallerContext]]] = None) -> None:
+        # Pooled sessions arrive connected with tools registered; only the
+        # facility prompt (and caller context, if any) is left to send.
+        started = time.perf_counter()
+        lookup = asyncio.ensure_future(caller_lookup) if caller_lookup is not None else None
+        try:
+            self.ws = await realtime_pool.acquire()
+        except BaseException:
+            if lookup is not None:
+                lookup.cancel()
+            raise
+        connected = time.perf_counter()
+        if lookup is not None:
+            self.caller = await lookup
         await self._send_system_prompt()
-        await self._register_tools()
+        if self.timing:
+            self.timing.stage("realtime_connect", connected - started)
+            self.timing.stage("prompt_send", time.perf_counter() - connected)
 
     async def _send_system_prompt(self) -> None:
-        prompt = build_system_prompt(self.facility, self.config)
-        await self.ws.send(json.dumps({"type": "system", "content": prompt}))
-
-    async def _register_tools(self) -> None:
-        # Define tool schemas for the Realtime API.
-        payload = {
-            "type": "register_tools",
-            "tools": [
-                {
-                    "name": "check_availability",
-                    "description": "Check available time slots for a facility on a date",
-                    "parameters": {
-                        "facility_id": "string",
-                        "date": "string",
-                    },
-                },
-                {
-                    "name": "create_booking",
-                    "description": "Create a booking for a customer",
-                    "parameters": {
-                        "facility_id": "string",
-                        "customer_name": "string",
-                        "customer_phone": "string",
-                        "start": "string",
-                        "end": "string",
-                    },
-                },
-            ],
-        }
-        await self.ws.send(json.dumps(payload))
+        prompt = compiled_prompt(self.facility, self.config, self.courts)
+        await self.ws.send(prompt.message, text=True)
+        if self.caller is not None:
+            content = build_caller_context(self.caller, self.facility.timezone)
+            await self.ws.send(codec.dumps_bytes({"type": "system", "content": content}), text=True)
+
+    async def send_audio(self, pcm16: bytes) -> None:
+        """Append caller audio (PCM16, 24 kHz, mono) to the input buffer."""
+        await self.ws.send(codec.audio_append_message(base64.b64encode(pcm16).decode("ascii")))
 
     async def listen(self) -> None:
         async for message in self.ws:
-            data = json.loads(message)
-            if data.get("type") == "tool_call":
-                await self._handle_tool_call(data)
-            # TODO: handle other message types such as text/audio generation
+            # Audio deltas dominate the stream; skip building a dict for them.
+            delta = codec.peek_audio_delta(message)
+            if delta is not None:
+                await self._handle_audio_delta(delta)
+                continue
+            data = codec.loads(message)
+            message_type = data.get("type")
+            if message_type == "tool_call":
+                self._dispatch_tool_call(data)
+            elif message_type == "response.audio.delta":
+                await self._handle_audio_delta(data["delta"])
+            elif message_type == "response.created":
+                self._interrupted = False
+            elif message_type == "response.audio.done":
+                if self.on_audio_done and not self._interrupted:
+                    await self.on_audio_done()
+            elif message_type == "input_audio_buffer.speech_started":
+                self._interrupted = True
+                if self.on_speech_started:
+                    await self.on_speech_started()
+            elif message_type == "input_audio_buffer.speech_stopped":
+                self._speech_stopped_at = time.perf_counter()
+            elif message_type == "conversation.item.input_audio_transcription.completed":
+                if self.recorder:
+                    await self.recorder.transcript("caller", data.get("transcript", ""))
+            elif message_type == "response.audio_transcript.done":
+                if self.recorder:
+                    await self.recorder.transcript("assistant", data.get("transcript", ""))
+            # TODO: handle other message types such as text generation
+
+    async def _handle_audio_delta(self, delta: str) -> None:
+        if self._interrupted:
+            return
+        if self._speech_stopped_at is not None:
+            # First audio of the reply: how long the caller waited after they stopped talking.
+            elapsed_ms = (time.perf_counter() - self._speech_stopped_at) * 1000
+            self._speech_stopped_at = None
+            if self.timing:
+                self.timing.stage("response_start", elapsed_ms / 1000)
+            if self.recorder:
+                await self.recorder.latency("response_start", elapsed_ms)
+        if self.on_audio:
+            await self.on_audio(base64.b64decode(delta))
+
+    def _dispatch_tool_call(self, data: Dict[str, Any]) -> None:
+        task = asyncio.create_task(self._handle_tool_call(data, previous=self._last_delivery))
+        self._last_delivery = task
+        self._tool_tasks.add(task)
+        task.add_done_callback(self._tool_tasks.discard)
 
-    async def _handle_tool_call(self, data: Dict[str, Any]) -> None:
+    async def _handle_tool_call(self, data: Dict[str, Any], previous: Optional[asyncio.Task] = None) -> None:
         name = data["name"]
-        args = data.get("arguments", {})
-        tool_id = data.get("id")
+        arguments = data.get("arguments", {})
+        timeout = TOOL_TIMEOUTS.get(name, DEFAULT_TOOL_TIMEOUT)
+        started = time.perf_counter()
+        io = metrics.IoBreakdown()
+        try:
+            if name in WRITE_TOOLS:
+                write = asyncio.ensure_future(self._run_tool(name, arguments, io))
+                _background_writes.add(write)
+                write.add_done_callback(_background_writes.discard)
+                try:
+                    result = await asyncio.wait_for(asyncio.shield(write), timeout)
+                except (asyncio.TimeoutError, asyncio.CancelledError):
+                    write.add_done_callback(_log_abandoned_write(name))
+                    raise
+            else:
+                result = await asyncio.wait_for(self._run_tool(name, arguments, io), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Tool %s timed out after %.1fs", name, timeout)
+            if name in WRITE_TOOLS:
+                # The write carries on; retrying could book twice.
+                result = {
+                    "error": "timeout",
+                    "message": "The booking is still being saved. Do not retry; tell the caller it will be confirmed shortly.",
+                }
+            else:
+                result = {"error": "timeout", "message": "That took too long. Apologise and offer to try again."}
+        except Exception:
+            logger.exception("Tool %s failed", name)
+            result = {
+                "error": "tool_failed",
+                "message": "Something went wrong. Let the caller know a human will call back.",
+            }
+        elapsed = time.perf_counter() - started
+        if self.timing:
+            self.timing.tool(name, elapsed, io)
+        if self.recorder:
+            await self.recorder.tool_call(name, arguments, result, elapsed * 1000)
+
+        # Results go back in the order the calls arrived, even if a later tool finished first.
+        if previous is not None:
+            await asyncio.wait([previous])
+        response = {"type": "tool_result", "tool_id": data.get("id"), "result": result}
+        await self.ws.send(codec.dumps_bytes(response), text=True)
+
+    async def _run_tool(self, name: str, args: Dict[str, Any], io: Optional[metrics.IoBreakdown] = None) -> Any:
+        # A connection is checked out only while the tool runs, not for the whole call;
+        # on timeout or hang-up the session closes and rolls back.
+        with metrics.track_io(io):
+            async with SessionLocal() as session:
+                return await self._call_tool(session, name, args)
+
+    async def _call_tool(self, session: AsyncSession, name: str, args: Dict[str, Any]) -> Any:
+        # The facility always comes from the call's routing, never from the model.
         if name == "check_availability":
             result = await tools.check_availability_tool(
-                self.session,
-                facility_id=args.get("facility_id"),
+                session,
+                facility_id=self.facility.id,
                 date=datetime.fromisoformat(args.get("date")),
             )
+        elif name == "find_next_available":
+            result = await tools.find_next_available_tool(
+                session,
+                facility_id=self.facility.id,
+                from_date=date.fromisoformat(args.get("from_date")),
+                to_date=date.fromisoformat(args["to_date"]) if args.get("to_date") else None,
+                earliest_time=clock_time.fromisoformat(args["earliest_time"]) if args.get("earliest_time") else None,
+                latest_time=clock_time.fromisoformat(args["latest_time"]) if args.get("latest_time") else None,
+                weekdays=args.get("weekdays"),
+                duration_minutes=int(args["duration_minutes"]) if args.get("duration_minutes") else None,
+                courts=int(args.get("courts") or 1),
+                limit=int(args.get("limit") or tools.SEARCH_DEFAULT_LIMIT),
+            )
+        elif name == "hold_slot":
+            result = await tools.hold_slot_tool(
+                session,
+                facility_id=self.facility.id,
+                start=datetime.fromisoformat(args.get("start")),
+                end=datetime.fromisoformat(args.get("end")),
+            )
         elif name == "create_booking":
             result = await tools.create_booking_tool(
-                self.session,
-                facility_id=args.get("facility_id"),
-                customer_name=args.get("customer_name"),
-                customer_phone=args.get("customer_phone"),
+                session,
+                facility_id=self.facility.id,
+                customer_name=args.get("customer_name") or (self.caller.name if self.caller else None),
+                customer_phone=args.get("customer_phone") or (self.caller.phone if self.caller else None),
                 start=datetime.fromisoformat(args.get("start")),
                 end=datetime.fromisoformat(args.get("end")),
+                hold_id=UUID(args["hold_id"]) if args.get("hold_id") else None,
+            )
+        elif name == "create_recurring_booking":
+            result = await tools.create_recurring_booking_tool(
+                session,
+                facility_id=self.facility.id,
+                customer_name=args.get("customer_name") or (self.caller.name if self.caller else None),
+                customer_phone=args.get("customer_phone") or (self.caller.phone if self.caller else None),
+                weekdays=args.get("weekdays") or [],
+                start_time=clock_time.fromisoformat(args.get("start_time")),
+                end_time=clock_time.fromisoformat(args.get("end_time")),
+                from_date=date.fromisoformat(args.get("from_date")),
+                to_date=date.fromisoformat(args.get("to_date")),
+                courts=int(args.get("courts") or 1),
+                dry_run=bool(args.get("dry_run")),
             )
         else:
             result = {"error": "Unknown tool"}
-
-        response = {"type": "tool_result", "tool_id": tool_id, "result": result}
-        await self.ws.send(json.dumps(response))
+        return result
 
     async def close(self) -> None:
+        # Hang-up: abandon in-flight tools; their sessions roll back as they unwind.
+        # Shielded writes are not among them and run to commit or rollback on their own.
+        for task in list(self._tool_tasks):
+            task.cancel()
+        if self._tool_tasks:
+            await asyncio.gather(*self._tool_tasks, return_exceptions=True)
         if self.ws:
             await self.ws.close()
+
+
+def _log_abandoned_write(name: str) -> Callable[[asyncio.Task], None]:
+    def done(task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error("Tool %s failed after the call stopped waiting", name, exc_info=task.exception())
+        else:
+            logger.info("Tool %s finished after the call stopped waiting: %r", name, task.result())
+
+    return done
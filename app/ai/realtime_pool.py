@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Optional, Set
+
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.protocol import State
+
+from app.ai.prompt_cache import TOOL_REGISTRATION
+from app.config import get_settings
+from app.utils import codec
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def open_realtime_session(
+    url: Optional[str] = None, api_key: Optional[str] = None, ready_timeout: float = 10.0
+) -> ClientConnection:
+    """Connect, wait for the server's ``session.created`` and register the tools.
+
+    Everything here is facility-independent; the facility prompt is sent
+    once the session is attached to a call.
+    """
+    key = settings.openai_api_key if api_key is None else api_key
+    ws = await connect(url or settings.openai_realtime_url, additional_headers={"Authorization": f"Bearer {key}"})
+    try:
+        while True:
+            event = codec.loads(await asyncio.wait_for(ws.recv(), timeout=ready_timeout))
+            if event.get("type") == "session.created":
+                break
+            if event.get("type") == "error":
+                raise ConnectionError(f"Realtime session failed to start: {event.get('error')}")
+        await ws.send(TOOL_REGISTRATION, text=True)
+    except BaseException:
+        await ws.close()
+        raise
+    return ws
+
+
+@dataclass
+class _WarmSession:
+    ws: ClientConnection
+    opened_at: float
+
+
+@dataclass
+class RealtimePoolStats:
+    hits: int = 0
+    misses: int = 0
+    opened: int = 0
+    open_failures: int = 0
+    recycled: int = 0
+    unhealthy: int = 0
+
+
+class RealtimeSessionPool:
+    """Pre-connected, tool-registered Realtime sessions ready to hand to a call.
+
+    The idle target follows the recent call rate: enough sessions to cover
+    the calls expected over ``horizon_seconds``, clamped to
+    ``[min_size, max_size]``. Idle sessions are pinged every
+    ``health_interval`` and closed once they have been idle for
+    ``max_idle_seconds``. The server ends a session ``session_max_seconds``
+    after it opened, and a session handed out keeps running for the whole
+    call, so a session older than ``session_max_seconds -
+    max_call_seconds`` is closed too, whatever ``max_idle_seconds`` says.
+    Sessions are single-use: a call owns its session and closes it when it
+    ends.
+    """
+
+    def __init__(
+        self,
+        min_size: int,
+        max_size: int,
+        horizon_seconds: float,
+        max_idle_seconds: float,
+        health_interval: float,
+        session_max_seconds: float = math.inf,
+        max_call_seconds: float = 0.0,
+        opener: Callable[[], Awaitable[ClientConnection]] = open_realtime_session,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_call_seconds >= session_max_seconds:
+            raise ValueError(
+                f"A {max_call_seconds:g}s call does not fit in a {session_max_seconds:g}s Realtime session"
+            )
+        self.min_size = min_size
+        self.max_size = max_size
+        self.horizon_seconds = horizon_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self.session_max_seconds = session_max_seconds
+        self.max_call_seconds = max_call_seconds
+        # Oldest session still handed out: idle limit, or whatever leaves room for a full call.
+        self._max_age = min(max_idle_seconds, session_max_seconds - max_call_seconds)
+        self.health_interval = health_interval
+        self._opener = opener
+        self._clock = clock
+        self._idle: Deque[_WarmSession] = deque()
+        self._arrivals: Deque[float] = deque()
+        self._opening = 0
+        self._closing: Set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = RealtimePoolStats()
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def call_rate(self) -> float:
+        """Calls per second over the sizing horizon."""
+        cutoff = self._clock() - self.horizon_seconds
+        while self._arrivals and self._arrivals[0] < cutoff:
+            self._arrivals.popleft()
+        return len(self._arrivals) / self.horizon_seconds
+
+    def target_size(self) -> int:
+        expected = math.ceil(self.call_rate() * self.horizon_seconds)
+        return max(self.min_size, min(self.max_size, expected))
+
+    def _usable(self, session: _WarmSession) -> bool:
+        return session.ws.state is State.OPEN and self._clock() - session.opened_at < self._max_age
+
+    def _discard(self, session: _WarmSession) -> None:
+        self._idle.remove(session)
+        task = asyncio.create_task(session.ws.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def acquire(self) -> ClientConnection:
+        """Return a ready session, falling back to a cold open when the pool is empty."""
+        self._arrivals.append(self._clock())
+        self.call_rate()  # trims old arrivals
+        try:
+            while self._idle:
+                session = self._idle[0]
+                if self._usable(session):
+                    self._idle.popleft()
+                    self.stats.hits += 1
+                    return session.ws
+                self.stats.recycled += 1
+                self._discard(session)
+            self.stats.misses += 1
+            return await self._opener()
+        finally:
+            self._wake.set()
+
+    async def _open_one(self) -> None:
+        self._opening += 1
+        try:
+            ws = await self._opener()
+        except Exception as exc:
+            self.stats.open_failures += 1
+            logger.warning("Could not pre-warm Realtime session: %s", exc)
+            return
+        finally:
+            self._opening -= 1
+        self.stats.opened += 1
+        self._idle.append(_WarmSession(ws=ws, opened_at=self._clock()))
+
+    async def _check(self, session: _WarmSession) -> bool:
+        try:
+            pong = await session.ws.ping()
+            await asyncio.wait_for(pong, timeout=min(5.0, self.health_interval))
+            return True
+        except Exception:
+            return False
+
+    async def maintain(self, health_check: bool = False) -> None:
+        """Drop stale or dead sessions, then grow or shrink toward the target size."""
+        for session in list(self._idle):
+            if not self._usable(session):
+                self.stats.recycled += 1
+                self._discard(session)
+        if health_check and self._idle:
+            # Sessions stay acquirable while they are pinged.
+            sessions = list(self._idle)
+            healthy = await asyncio.gather(*(self._check(session) for session in sessions))
+            for session, ok in zip(sessions, healthy):
+                if not ok and session in self._idle:
+                    self.stats.unhealthy += 1
+                    self._discard(session)
+
+        target = self.target_size()
+        while len(self._idle) > target:
+            self._discard(self._idle[0])
+        missing = target - len(self._idle) - self._opening
+        if missing > 0:
+            await asyncio.gather(*(self._open_one() for _ in range(missing)))
+
+    async def _run(self) -> None:
+        next_health = self._clock() + self.health_interval
+        while True:
+            due = self._clock() >= next_health
+            self._wake.clear()
+            try:
+                await self.maintain(health_check=due)
+            except Exception:
+                logger.exception("Realtime pool maintenance failed")
+            if due:
+                next_health = self._clock() + self.health_interval
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, next_health - self._clock()))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None and self.max_size > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._idle:
+            self._discard(self._idle[0])
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+
+realtime_pool = RealtimeSessionPool(
+    min_size=settings.realtime_pool_min_size,
+    max_size=settings.realtime_pool_max_size,
+    horizon_seconds=settings.realtime_pool_horizon_seconds,
+    max_idle_seconds=settings.realtime_pool_max_idle_seconds,
+    health_interval=settings.realtime_pool_health_seconds,
+    session_max_seconds=settings.realtime_session_max_seconds,
+    max_call_seconds=settings.realtime_max_call_seconds,
+)
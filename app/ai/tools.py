@@ -1,20 +1,166 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, List
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Sequence
 from uuid import UUID
 
+import pytz
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.booking_service import check_availability, create_booking
+from app.booking_service import (
+    Recurrence,
+    SlotSearch,
+    SlotTakenError,
+    check_availability,
+    create_booking,
+    create_recurring_booking,
+    find_next_available,
+    get_facility_with_config,
+    hold_slot,
+)
+from app.holds import slot_holds
 from app.schemas import SlotOption
 
+MAX_ALTERNATIVES = 3
+# Defaults for find_next_available when the model leaves them out.
+SEARCH_DEFAULT_DAYS = 14
+SEARCH_DEFAULT_LIMIT = 5
+SEARCH_MAX_LIMIT = 10
+
+# Tool schemas registered with the Realtime API; the handlers below back them.
+TOOL_SCHEMAS: List[Dict[str, Any]] = [
+    {
+        "name": "check_availability",
+        "description": "Check available time slots for a facility on a date",
+        "parameters": {
+            "date": "string",
+        },
+    },
+    {
+        "name": "find_next_available",
+        "description": (
+            "Find the earliest free slots over a range of days, e.g. the next free Saturday evening. "
+            "Times are HH:MM local; weekdays are names like sat, sun"
+        ),
+        "parameters": {
+            "from_date": "string",
+            "to_date": "string",
+            "earliest_time": "string",
+            "latest_time": "string",
+            "weekdays": "array",
+            "duration_minutes": "integer",
+            "courts": "integer",
+            "limit": "integer",
+        },
+    },
+    {
+        "name": "hold_slot",
+        "description": "Hold a slot for a couple of minutes while confirming the caller's details",
+        "parameters": {
+            "start": "string",
+            "end": "string",
+        },
+    },
+    {
+        "name": "create_booking",
+        "description": "Create a booking for a customer, converting the hold if one was placed",
+        "parameters": {
+            "customer_name": "string",
+            "customer_phone": "string",
+            "start": "string",
+            "end": "string",
+            "hold_id": "string",
+        },
+    },
+    {
+        "name": "create_recurring_booking",
+        "description": (
+            "Book the same weekly slot on several weekdays over a date range, e.g. Mon/Wed 06:00-08:00 "
+            "for three months. Run with dry_run true first and read the conflicts back to the caller"
+        ),
+        "parameters": {
+            "customer_name": "string",
+            "customer_phone": "string",
+            "weekdays": "array",
+            "start_time": "string",
+            "end_time": "string",
+            "from_date": "string",
+            "to_date": "string",
+            "courts": "integer",
+            "dry_run": "boolean",
+        },
+    },
+]
+
+
+async def _nearest_alternatives(
+    session: AsyncSession, facility_id: UUID, start: datetime, end: datetime
+) -> List[Dict[str, Any]]:
+    """Free slots of the requested length on the same day, closest start first."""
+    facility_data = await get_facility_with_config(session, facility_id)
+    day = start.astimezone(pytz.timezone(facility_data.facility.timezone)).date()
+    search = SlotSearch(
+        start_date=day,
+        end_date=day,
+        duration_minutes=int((end - start).total_seconds()) // 60,
+    )
+    # Every start on the day's grid, so the closest ones can be picked rather than the earliest.
+    per_day = 24 * 60 // facility_data.config.slot_minutes
+    slots = await find_next_available(session, facility_id, search, per_day)
+    slots.sort(key=lambda slot: abs((slot.start - start).total_seconds()))
+    return [slot.dict() for slot in slots[:MAX_ALTERNATIVES]]
+
 
 async def check_availability_tool(session: AsyncSession, facility_id: UUID, date: datetime) -> List[Dict[str, Any]]:
     slots = await check_availability(session, facility_id, date)
     return [slot.dict() for slot in slots]
 
 
+async def find_next_available_tool(
+    session: AsyncSession,
+    facility_id: UUID,
+    from_date: date,
+    to_date: Optional[date] = None,
+    earliest_time: Optional[time] = None,
+    latest_time: Optional[time] = None,
+    weekdays: Optional[Sequence[str]] = None,
+    duration_minutes: Optional[int] = None,
+    courts: int = 1,
+    limit: int = SEARCH_DEFAULT_LIMIT,
+) -> Dict[str, Any]:
+    search = SlotSearch(
+        start_date=from_date,
+        end_date=to_date or from_date + timedelta(days=SEARCH_DEFAULT_DAYS - 1),
+        earliest=earliest_time,
+        latest=latest_time,
+        weekdays=frozenset(day.strip().lower()[:3] for day in weekdays) if weekdays else None,
+        duration_minutes=duration_minutes,
+        courts=courts,
+    )
+    try:
+        slots = await find_next_available(session, facility_id, search, min(limit, SEARCH_MAX_LIMIT))
+    except ValueError as exc:
+        return {"error": "invalid_search", "message": str(exc)}
+    return {"slots": [slot.dict() for slot in slots], "searched_to": search.end_date.isoformat()}
+
+
+async def hold_slot_tool(session: AsyncSession, facility_id: UUID, start: datetime, end: datetime) -> Dict[str, Any]:
+    try:
+        hold = await hold_slot(session, facility_id, SlotOption(start=start, end=end))
+    except SlotTakenError as exc:
+        return {
+            "error": "slot_taken",
+            "message": "That slot is no longer free. Offer the caller one of the alternatives.",
+            "alternatives": await _nearest_alternatives(session, facility_id, exc.start, exc.end),
+        }
+    return {
+        "hold_id": str(hold.id),
+        "start": hold.start.isoformat(),
+        "end": hold.end.isoformat(),
+        "expires_in_seconds": int(slot_holds.seconds_left(hold)),
+    }
+
+
 async def create_booking_tool(
     session: AsyncSession,
     facility_id: UUID,
@@ -22,18 +168,85 @@ async def create_booking_tool(
     customer_phone: str,
     start: datetime,
     end: datetime,
+    hold_id: Optional[UUID] = None,
 ) -> Dict[str, Any]:
     slot = SlotOption(start=start, end=end)
-    booking = await create_booking(
-        session,
-        facility_id=facility_id,
-        customer_name=customer_name,
-        customer_phone=customer_phone,
-        slot=slot,
-    )
+    try:
+        booking = await create_booking(
+            session,
+            facility_id=facility_id,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            slot=slot,
+            hold_id=hold_id,
+        )
+    except SlotTakenError as exc:
+        await session.rollback()
+        return {
+            "error": "slot_taken",
+            "message": "That slot was just taken. Offer the caller one of the alternatives.",
+            "alternatives": await _nearest_alternatives(session, facility_id, exc.start, exc.end),
+        }
     await session.commit()
     return {
         "booking_id": str(booking.id),
         "start": booking.start_time.isoformat(),
         "end": booking.end_time.isoformat(),
+        "court_id": str(booking.court_id) if booking.court_id else None,
+        "price": float(booking.price) if booking.price is not None else None,
+    }
+
+
+async def create_recurring_booking_tool(
+    session: AsyncSession,
+    facility_id: UUID,
+    customer_name: str,
+    customer_phone: str,
+    weekdays: Sequence[str],
+    start_time: time,
+    end_time: time,
+    from_date: date,
+    to_date: date,
+    courts: int = 1,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    recurrence = Recurrence(
+        weekdays=frozenset(day.strip().lower()[:3] for day in weekdays),
+        start_time=start_time,
+        end_time=end_time,
+        start_date=from_date,
+        end_date=to_date,
+    )
+    try:
+        result = await create_recurring_booking(
+            session,
+            facility_id=facility_id,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            recurrence=recurrence,
+            courts=courts,
+            dry_run=dry_run,
+        )
+    except SlotTakenError:
+        await session.rollback()
+        return {
+            "error": "slot_taken",
+            "message": "Some of those slots were just taken. Run the request again to see what is still free.",
+        }
+    except ValueError as exc:
+        await session.rollback()
+        return {"error": "invalid_request", "message": str(exc)}
+    if not dry_run:
+        await session.commit()
+    return {
+        "dry_run": dry_run,
+        "occurrences": result.occurrences,
+        "booked": sorted({booking.start_time.isoformat() for booking in result.booked}),
+        "booking_ids": [] if dry_run else [str(booking.id) for booking in result.booked],
+        "conflicts": [start.isoformat() for start, _ in result.conflicts],
+        "total_price": (
+            float(sum(booking.price for booking in result.booked))
+            if result.booked and all(booking.price is not None for booking in result.booked)
+            else None
+        ),
     }
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+Interval = Tuple[datetime, datetime]
+
+
+class CourtOccupancy:
+    """Courts x slots occupancy for one day at slot granularity.
+
+    Busy time from a court's own calendar marks that court's row of a bool
+    matrix. Busy time that is not tied to a court (the facility calendar)
+    consumes one court of capacity per slot without naming which. Marks are
+    accumulated in difference arrays and resolved with one cumulative sum,
+    so "free courts per slot" and "any free court" are vectorised over all
+    courts.
+    """
+
+    def __init__(self, slots: Sequence[Interval], lanes: Sequence[Optional[UUID]]):
+        self.slots: List[Interval] = sorted(slots)
+        self.lanes: List[Optional[UUID]] = list(lanes)
+        self._starts = np.array([start.timestamp() for start, _ in self.slots], dtype=np.float64)
+        self._ends = np.array([end.timestamp() for _, end in self.slots], dtype=np.float64)
+        self._court_diff = np.zeros((len(self.lanes), len(self.slots) + 1), dtype=np.int32)
+        self._shared_diff = np.zeros(len(self.slots) + 1, dtype=np.int32)
+        self._court_busy: Optional[np.ndarray] = None
+        self._shared_busy: Optional[np.ndarray] = None
+
+    def _spans(self, intervals: Iterable[Interval]) -> Tuple[np.ndarray, np.ndarray]:
+        # Slots share one length, so sorting by start also sorts ends and the
+        # covered slots of an interval form one contiguous index range.
+        bounds = np.array([(s.timestamp(), e.timestamp()) for s, e in intervals], dtype=np.float64).reshape(-1, 2)
+        lo = np.searchsorted(self._ends, bounds[:, 0], side="right")
+        hi = np.searchsorted(self._starts, bounds[:, 1], side="left")
+        keep = lo < hi
+        return lo[keep], hi[keep]
+
+    def add_court_busy(self, lane: int, intervals: Iterable[Interval]) -> None:
+        lo, hi = self._spans(intervals)
+        np.add.at(self._court_diff[lane], lo, 1)
+        np.add.at(self._court_diff[lane], hi, -1)
+        self._court_busy = None
+
+    def add_shared_busy(self, intervals: Iterable[Interval]) -> None:
+        lo, hi = self._spans(intervals)
+        np.add.at(self._shared_diff, lo, 1)
+        np.add.at(self._shared_diff, hi, -1)
+        self._shared_busy = None
+
+    @property
+    def court_busy(self) -> np.ndarray:
+        if self._court_busy is None:
+            self._court_busy = np.cumsum(self._court_diff[:, :-1], axis=1) > 0
+        return self._court_busy
+
+    @property
+    def shared_busy(self) -> np.ndarray:
+        if self._shared_busy is None:
+            self._shared_busy = np.cumsum(self._shared_diff[:-1])
+        return self._shared_busy
+
+    def free_counts(self) -> np.ndarray:
+        free = (~self.court_busy).sum(axis=0) - self.shared_busy
+        return np.clip(free, 0, None)
+
+    def free_court(self, start: datetime, end: datetime, exclude: Iterable[int] = ()) -> Optional[int]:
+        """Return the index of a court free for the whole of [start, end), if capacity allows."""
+        lo, hi = self._spans([(start, end)])
+        if not len(lo):
+            return None
+        lo, hi = int(lo[0]), int(hi[0])
+        if (self.free_counts()[lo:hi] < 1).any():
+            return None
+        candidates = ~self.court_busy[:, lo:hi].any(axis=1)
+        candidates[list(exclude)] = False
+        free = np.flatnonzero(candidates)
+        return int(free[0]) if len(free) else None
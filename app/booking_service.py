@@ -1,42 +1,279 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List
+import logging
+import uuid
+from collections import Counter
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import cached_property
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
 
+import numpy as np
 import pytz
-from sqlalchemy import select
+from sqlalchemy import Row, func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app import calendar_client
-from app.models import Booking, Customer, Facility, FacilityConfig
+from app.availability import CourtOccupancy, Interval
+from app.busy_store import busy_store
+from app.calendar_outbox import (
+    enqueue_calendar_event,
+    enqueue_calendar_events,
+    event_id_for,
+    event_id_for_booking,
+    outbox_worker,
+)
+from app.config import get_settings
+from app.db import run_after_commit
+from app.holds import SlotHold, slot_holds
+from app.models import Booking, Court, Customer, Facility, FacilityConfig
+from app.pricing import PriceTable, compile_pricing
 from app.schemas import SlotOption
-from app.utils.time_utils import generate_slots_for_day, slot_overlaps
+from app.utils.cache import CacheStats, TTLCache
+from app.utils.time_utils import WEEKDAY_KEYS, generate_slots_for_day
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PER_COURT_CALENDAR_MODE = "per_court"
+# SQLSTATE for exclusion_violation, raised by bookings_no_court_overlap.
+EXCLUSION_VIOLATION = "23P01"
+
+
+class SlotTakenError(ValueError):
+    """No court is free for the requested slot (including lost booking races)."""
+
+    def __init__(self, start: datetime, end: datetime):
+        super().__init__("No court available for the requested slot")
+        self.start = start
+        self.end = end
 
 
 @dataclass
 class FacilityWithConfig:
     facility: Facility
     config: FacilityConfig
+    courts: List[Court] = field(default_factory=list)
+
+    @property
+    def lanes(self) -> List[Optional[Court]]:
+        """Bookable courts: Court rows capped at max_courts, padded with unnamed courts."""
+        courts = self.courts[: self.config.max_courts]
+        return courts + [None] * (self.config.max_courts - len(courts))
+
+    @cached_property
+    def pricing(self) -> Optional[PriceTable]:
+        """Compiled pricing_rules; cached with the entry, so it is rebuilt whenever the config is reloaded."""
+        try:
+            return compile_pricing(self.config.pricing_rules)
+        except ValueError:
+            logger.warning("Ignoring pricing rules for facility %s", self.facility.id, exc_info=True)
+            return None
+
+    def price(self, start: datetime, end: datetime, court: Optional[Court] = None) -> Optional[float]:
+        """Price of one court for a slot given in local time, or None without pricing rules."""
+        pricing = self.pricing
+        return pricing.price(start, end, court) if pricing is not None else None
+
+    def prices(self, slots: Sequence[Tuple[datetime, datetime]]) -> List[Optional[float]]:
+        """Standard-court prices for many local-time slots in one pass; all None without pricing rules."""
+        pricing = self.pricing
+        return pricing.prices(slots) if pricing is not None else [None] * len(slots)
+
+
+_facility_cache: TTLCache[FacilityWithConfig] = TTLCache(
+    maxsize=settings.facility_cache_max_entries,
+    ttl_seconds=settings.facility_cache_ttl_seconds,
+)
+
+
+def _facility_key(facility_id: UUID | str) -> UUID:
+    # Tool calls pass ids as strings, HTTP routes as UUIDs; share one cache entry.
+    return facility_id if isinstance(facility_id, UUID) else UUID(str(facility_id))
+
+
+def invalidate_facility_cache(facility_id: Optional[UUID] = None) -> None:
+    """Drop cached facility/config data; call after editing a facility or its config.
+
+    With no ``facility_id`` the whole cache is cleared.
+    """
+    if facility_id is None:
+        _facility_cache.clear()
+    else:
+        _facility_cache.invalidate(_facility_key(facility_id))
+
+
+def facility_cache_stats() -> CacheStats:
+    return _facility_cache.stats
 
 
 async def get_facility_with_config(session: AsyncSession, facility_id: UUID) -> FacilityWithConfig:
-    facility_result = await session.execute(
-        select(Facility).where(Facility.id == facility_id)
-    )
-    facility = facility_result.scalar_one_or_none()
-    if not facility:
-        raise ValueError("Facility not found")
+    key = _facility_key(facility_id)
+    cached = _facility_cache.get(key)
+    if cached is not None:
+        return cached
 
-    config_result = await session.execute(
-        select(FacilityConfig).where(FacilityConfig.facility_id == facility_id)
+    result = await session.execute(
+        select(Facility, FacilityConfig)
+        .outerjoin(FacilityConfig, FacilityConfig.facility_id == Facility.id)
+        .options(joinedload(Facility.courts))
+        .where(Facility.id == key)
     )
-    config = config_result.scalar_one_or_none()
+    row = result.unique().first()
+    if not row:
+        raise ValueError("Facility not found")
+    facility, config = row
     if not config:
         raise ValueError("Facility config missing")
 
-    return FacilityWithConfig(facility=facility, config=config)
+    courts = sorted(facility.courts, key=lambda court: (court.created_at, court.name))
+    # Detach the cached objects so a rollback in this session cannot expire them.
+    for instance in (facility, config, *courts):
+        if instance in session:
+            session.expunge(instance)
+    facility_data = FacilityWithConfig(facility=facility, config=config, courts=courts)
+    _facility_cache.set(key, facility_data)
+    return facility_data
+
+
+def _facility_calendar_id(facility: Facility) -> str:
+    return facility.phone_number
+
+
+def _court_calendar_ids(facility_data: FacilityWithConfig) -> Dict[int, str]:
+    """Map court index -> calendar id for courts with their own calendar."""
+    if facility_data.config.google_calendar_mode != PER_COURT_CALENDAR_MODE:
+        return {}
+    return {
+        idx: court.calendar_id
+        for idx, court in enumerate(facility_data.lanes)
+        if court is not None and court.calendar_id
+    }
+
+
+@dataclass
+class _BusySnapshot:
+    """Busy intervals over a window, fetched once and reused for every slot grid in it."""
+
+    shared: List[Interval]  # facility calendar events and holds: one court of capacity each
+    courts: Dict[int, List[Interval]]  # court index -> its own calendar's events
+    # Ids of the calendar events read, or None if a read fell back to free/busy (which has no ids).
+    event_ids: Optional[Set[str]] = None
+
+
+async def _fetch_busy(
+    facility_data: FacilityWithConfig,
+    window_start: datetime,
+    window_end: datetime,
+    ignore_hold: Optional[UUID] = None,
+    include_holds: bool = True,
+) -> _BusySnapshot:
+    court_calendars = _court_calendar_ids(facility_data)
+    calendar_ids = [_facility_calendar_id(facility_data.facility), *court_calendars.values()]
+    busy = await busy_store.busy_events_for(calendar_ids, window_start, window_end)
+    event_ids: Optional[Set[str]] = {event_id for events in busy.values() for event_id, _ in events}
+    if None in event_ids:
+        event_ids = None
+    # Facility calendar events and holds are not tied to a court; each takes one court of capacity.
+    shared = [interval for _, interval in busy[calendar_ids[0]]]
+    if include_holds:
+        shared.extend(slot_holds.intervals(facility_data.facility.id, exclude=ignore_hold))
+    courts = {lane: [interval for _, interval in busy[calendar_id]] for lane, calendar_id in court_calendars.items()}
+    return _BusySnapshot(shared=shared, courts=courts, event_ids=event_ids)
+
+
+async def _fetch_bookings(
+    session: AsyncSession, facility_id: UUID, window_start: datetime, window_end: datetime
+) -> Sequence[Row]:
+    """Live bookings overlapping the window: (id, court_id, start_time, end_time, google_event_id)."""
+    result = await session.execute(
+        select(Booking.id, Booking.court_id, Booking.start_time, Booking.end_time, Booking.google_event_id).where(
+            Booking.facility_id == facility_id,
+            Booking.status != "cancelled",
+            Booking.start_time < window_end,
+            Booking.end_time > window_start,
+        )
+    )
+    return result.all()
+
+
+def _add_bookings(facility_data: FacilityWithConfig, busy: _BusySnapshot, bookings: Sequence[Row]) -> None:
+    """Count bookings the calendars do not show yet against capacity.
+
+    A booking reaches its calendar only once the outbox delivers it, and
+    this process only sees the event after that (or a later sync). Bookings
+    whose event was read are already in ``busy``; with a free/busy fallback
+    read there are no ids, so a delivered ``google_event_id`` stands in.
+    """
+    lane_of = {court.id: idx for idx, court in enumerate(facility_data.lanes) if court is not None}
+    for booking in bookings:
+        if busy.event_ids is None:
+            if booking.google_event_id:
+                continue
+        elif event_id_for(booking.id) in busy.event_ids:
+            continue
+        interval = (booking.start_time, booking.end_time)
+        lane = lane_of.get(booking.court_id)
+        if lane is None:
+            busy.shared.append(interval)
+        else:
+            busy.courts.setdefault(lane, []).append(interval)
+
+
+def _occupancy_for(
+    facility_data: FacilityWithConfig, slots: Sequence[Tuple[datetime, datetime]], busy: _BusySnapshot
+) -> CourtOccupancy:
+    occupancy = CourtOccupancy(slots, [court.id if court else None for court in facility_data.lanes])
+    occupancy.add_shared_busy(busy.shared)
+    for lane, intervals in busy.courts.items():
+        occupancy.add_court_busy(lane, intervals)
+    return occupancy
+
+
+async def _build_occupancy(
+    session: AsyncSession,
+    facility_data: FacilityWithConfig,
+    slots: Sequence[Tuple[datetime, datetime]],
+    window_start: datetime,
+    window_end: datetime,
+) -> CourtOccupancy:
+    busy = await _fetch_busy(facility_data, window_start, window_end)
+    bookings = await _fetch_bookings(session, facility_data.facility.id, window_start, window_end)
+    _add_bookings(facility_data, busy, bookings)
+    return _occupancy_for(facility_data, slots, busy)
+
+
+def _advisory_lock_key(facility_id: UUID) -> int:
+    return int.from_bytes(facility_id.bytes[:8], "big", signed=True)
+
+
+async def _lock_facility_bookings(session: AsyncSession, facility_id: UUID) -> None:
+    """Serialise court assignment per facility until the transaction ends.
+
+    The exclusion constraint is the hard guarantee; the lock makes concurrent
+    bookings pick different courts instead of failing on it, and also covers
+    unnamed courts, which the constraint cannot see.
+    """
+    await session.execute(select(func.pg_advisory_xact_lock(_advisory_lock_key(facility_id))))
+
+
+def _assign_court(
+    occupancy: CourtOccupancy,
+    bookings: Sequence[Row],
+    start: datetime,
+    end: datetime,
+) -> Optional[int]:
+    """Pick a court index free on the calendars and not held by an overlapping booking."""
+    taken = Counter(booking.court_id for booking in bookings if booking.start_time < end and booking.end_time > start)
+    exclude = [idx for idx, court_id in enumerate(occupancy.lanes) if court_id is not None and taken[court_id]]
+    # Bookings without a court each occupy one of the unnamed courts.
+    unnamed = [idx for idx, court_id in enumerate(occupancy.lanes) if court_id is None]
+    exclude.extend(unnamed[: taken[None]])
+    return occupancy.free_court(start, end, exclude=exclude)
 
 
 async def check_availability(
@@ -53,18 +290,122 @@ async def check_availability(
     tz = pytz.timezone(facility.timezone)
     day_start_local = tz.localize(datetime.combine(target_date.date(), datetime.min.time()))
     day_end_local = tz.localize(datetime.combine(target_date.date(), datetime.max.time()))
-    busy_intervals_local = calendar_client.get_busy_intervals(
-        facility.phone_number, day_start_local, day_end_local
-    )
-    busy_intervals_utc = [(i[0].astimezone(pytz.UTC), i[1].astimezone(pytz.UTC)) for i in busy_intervals_local]
+    occupancy = await _build_occupancy(session, facility_data, slots, day_start_local, day_end_local)
 
-    available_slots: list[SlotOption] = []
-    for slot in slots:
-        slot_utc = (slot[0].astimezone(pytz.UTC), slot[1].astimezone(pytz.UTC))
-        if slot_overlaps(slot_utc, busy_intervals_utc):
-            continue
-        available_slots.append(SlotOption(start=slot_utc[0], end=slot_utc[1]))
-    return available_slots
+    free_slots = [(slot, int(free)) for slot, free in zip(occupancy.slots, occupancy.free_counts()) if free > 0]
+    # Prices quote a standard court; a court multiplier applies once a court is assigned.
+    prices = facility_data.prices([slot for slot, _ in free_slots])
+    # Every field is already of its declared type; validating them again costs more than the pricing.
+    return [
+        SlotOption.construct(
+            start=start.astimezone(pytz.UTC),
+            end=end.astimezone(pytz.UTC),
+            courts_available=free,
+            price=price,
+        )
+        for ((start, end), free), price in zip(free_slots, prices)
+    ]
+
+
+# Longest date range one search may cover.
+SEARCH_MAX_DAYS = 31
+
+
+@dataclass(frozen=True)
+class SlotSearch:
+    """Constraints for a multi-day free-slot search, in the facility's local time.
+
+    ``latest`` bounds the slot end. ``weekdays`` uses the ``open_hours``
+    keys ("mon" .. "sun"). ``duration_minutes`` defaults to the facility's
+    slot length; longer bookings start on the slot grid.
+    """
+
+    start_date: date
+    end_date: date
+    earliest: Optional[time] = None
+    latest: Optional[time] = None
+    weekdays: Optional[FrozenSet[str]] = None
+    duration_minutes: Optional[int] = None
+    courts: int = 1
+
+
+async def iter_free_slots(
+    session: AsyncSession, facility_id: UUID, search: SlotSearch
+) -> AsyncIterator[SlotOption]:
+    """Yield free slots matching ``search`` in start order, one day at a time.
+
+    Busy data for the whole range is fetched once up front; the occupancy
+    grid for each day is only built when the consumer asks for more, so a
+    caller that stops early never pays for the rest of the range.
+    """
+    facility_data = await get_facility_with_config(session, facility_id)
+    facility = facility_data.facility
+    config = facility_data.config
+    if (search.end_date - search.start_date).days >= SEARCH_MAX_DAYS:
+        raise ValueError(f"Search range is limited to {SEARCH_MAX_DAYS} days")
+    duration = search.duration_minutes or config.slot_minutes
+    if search.courts > config.max_courts:
+        return
+
+    tz = pytz.timezone(facility.timezone)
+    range_start = tz.localize(datetime.combine(search.start_date, time.min))
+    range_end = tz.localize(datetime.combine(search.end_date, time.max))
+    now = datetime.now(pytz.UTC)
+    if range_end < now:
+        return
+    window_start = max(range_start, now)
+    busy = await _fetch_busy(facility_data, window_start, range_end)
+    _add_bookings(facility_data, busy, await _fetch_bookings(session, facility.id, window_start, range_end))
+
+    day = search.start_date
+    while day <= search.end_date:
+        weekday = WEEKDAY_KEYS[day.weekday()]
+        daily_ranges = (config.open_hours.get(weekday) or []) if config.open_hours else []
+        if daily_ranges and (search.weekdays is None or weekday in search.weekdays):
+            slots = [
+                (start, end)
+                for start, end in generate_slots_for_day(
+                    datetime.combine(day, time.min),
+                    daily_ranges,
+                    duration,
+                    facility.timezone,
+                    step_minutes=config.slot_minutes,
+                )
+                if start >= now
+                and (search.earliest is None or start.time() >= search.earliest)
+                and (search.latest is None or end.time() <= search.latest)
+            ]
+            if slots:
+                occupancy = _occupancy_for(facility_data, slots, busy)
+                free_slots = [
+                    (slot, int(free))
+                    for slot, free in zip(occupancy.slots, occupancy.free_counts())
+                    if free >= search.courts
+                ]
+                prices = facility_data.prices([slot for slot, _ in free_slots])
+                for ((start, end), free), price in zip(free_slots, prices):
+                    yield SlotOption.construct(
+                        start=start.astimezone(pytz.UTC),
+                        end=end.astimezone(pytz.UTC),
+                        courts_available=free,
+                        price=price,
+                    )
+        day += timedelta(days=1)
+
+
+async def find_next_available(
+    session: AsyncSession, facility_id: UUID, search: SlotSearch, limit: int
+) -> List[SlotOption]:
+    """The earliest ``limit`` free slots matching ``search``."""
+    found: List[SlotOption] = []
+    if limit <= 0:
+        return found
+    async with aclosing(iter_free_slots(session, facility_id, search)) as slots:
+        async for slot in slots:
+            found.append(slot)
+            if len(found) >= limit:
+                break
+    return found
 
 
 async def upsert_customer(
@@ -87,37 +428,314 @@ async def upsert_customer(
     return customer
 
 
+def _as_price(amount: Optional[float]) -> Optional[Decimal]:
+    return Decimal(str(amount)) if amount is not None else None
+
+
+def _booking_committed(calendar_id: str, event_id: str, start: datetime, end: datetime) -> None:
+    # The event id is fixed up front, so the next calendar sync dedupes this local entry.
+    busy_store.record_event(calendar_id, event_id, start, end)
+    outbox_worker.notify()
+
+
+async def hold_slot(
+    session: AsyncSession,
+    facility_id: UUID,
+    slot: SlotOption,
+    ttl_seconds: Optional[float] = None,
+) -> SlotHold:
+    """Reserve a slot for a short time while the caller's details are confirmed.
+
+    Raises ``SlotTakenError`` if no court is free. Pass the hold id to
+    ``create_booking`` to convert it; otherwise it lapses after the TTL.
+    """
+    facility_data = await get_facility_with_config(session, facility_id)
+    start_utc = slot.start.astimezone(pytz.UTC)
+    end_utc = slot.end.astimezone(pytz.UTC)
+
+    # Holds are left out here and checked by slot_holds.place, which cannot be interleaved
+    # with another hold the way this function can across its awaits.
+    busy = await _fetch_busy(facility_data, start_utc, end_utc, include_holds=False)
+    bookings = await _fetch_bookings(session, facility_data.facility.id, start_utc, end_utc)
+    _add_bookings(facility_data, busy, bookings)
+    occupancy = _occupancy_for(facility_data, [(start_utc, end_utc)], busy)
+    if _assign_court(occupancy, bookings, start_utc, end_utc) is None:
+        raise SlotTakenError(start_utc, end_utc)
+    hold = slot_holds.place(
+        facility_data.facility.id,
+        start_utc,
+        end_utc,
+        ttl_seconds if ttl_seconds is not None else settings.slot_hold_ttl_seconds,
+        capacity=int(occupancy.free_counts().min()),
+    )
+    if hold is None:
+        raise SlotTakenError(start_utc, end_utc)
+    return hold
+
+
 async def create_booking(
     session: AsyncSession,
     facility_id: UUID,
     customer_name: str,
     customer_phone: str,
     slot: SlotOption,
+    hold_id: Optional[UUID] = None,
 ) -> Booking:
     facility_data = await get_facility_with_config(session, facility_id)
     facility = facility_data.facility
+    start_utc = slot.start.astimezone(pytz.UTC)
+    end_utc = slot.end.astimezone(pytz.UTC)
 
-    customer = await upsert_customer(session, facility_id, customer_name, customer_phone)
+    hold = slot_holds.get(hold_id) if hold_id is not None else None
+    if hold is not None and (hold.facility_id != facility.id or hold.start != start_utc or hold.end != end_utc):
+        # Only a hold on exactly this slot may be converted; any other keeps its court.
+        logger.warning("Hold %s does not match the requested slot; booking without it", hold_id)
+        hold = None
+    busy = await _fetch_busy(facility_data, start_utc, end_utc, ignore_hold=hold.id if hold else None)
+    await _lock_facility_bookings(session, facility.id)
+    # Read under the lock, so bookings committed while the calendars were fetched count too.
+    bookings = await _fetch_bookings(session, facility.id, start_utc, end_utc)
+    _add_bookings(facility_data, busy, bookings)
+    occupancy = _occupancy_for(facility_data, [(start_utc, end_utc)], busy)
+    lane = _assign_court(occupancy, bookings, start_utc, end_utc)
+    if lane is None:
+        raise SlotTakenError(start_utc, end_utc)
+    court = facility_data.lanes[lane]
 
-    # TODO: Support per-court calendars based on facility_config.google_calendar_mode
-    calendar_id = facility.phone_number
-    event_id = calendar_client.create_event(
-        calendar_id=calendar_id,
-        summary=f"Badminton booking - {customer.name or customer.phone}",
-        start=slot.start,
-        end=slot.end,
-        description="Created via AI receptionist",
-    )
+    customer = await upsert_customer(session, facility_id, customer_name, customer_phone)
 
+    tz = pytz.timezone(facility.timezone)
     booking = Booking(
         facility_id=facility_id,
+        court_id=court.id if court else None,
         customer_id=customer.id,
-        start_time=slot.start.astimezone(pytz.UTC),
-        end_time=slot.end.astimezone(pytz.UTC),
+        start_time=start_utc,
+        end_time=end_utc,
         status="confirmed",
-        google_event_id=event_id,
+        price=_as_price(facility_data.price(start_utc.astimezone(tz), end_utc.astimezone(tz), court)),
         source="phone_ai",
     )
-    session.add(booking)
+    # Insert before touching the calendar so a lost race never leaves a ghost event.
+    try:
+        async with session.begin_nested():
+            session.add(booking)
+            await session.flush()
+    except IntegrityError as exc:
+        if getattr(exc.orig, "sqlstate", None) == EXCLUSION_VIOLATION:
+            raise SlotTakenError(start_utc, end_utc) from exc
+        raise
+
+    # The calendar write goes through the outbox in this same transaction, so
+    # confirming the booking waits only on Postgres and a failed commit
+    # leaves no event behind.
+    calendar_id = _court_calendar_ids(facility_data).get(lane) or _facility_calendar_id(facility)
+    enqueue_calendar_event(
+        session,
+        booking,
+        calendar_id=calendar_id,
+        summary=f"Badminton booking - {customer.name or customer.phone}",
+        description="Created via AI receptionist",
+    )
     await session.flush()
+    event_id = event_id_for_booking(booking)
+    run_after_commit(session, lambda: _booking_committed(calendar_id, event_id, start_utc, end_utc))
+    if hold is not None:
+        # Until the booking commits the hold keeps the court; a rollback leaves it to its TTL.
+        run_after_commit(session, lambda: slot_holds.release(hold.id, converted=True))
     return booking
+
+
+# Upper bound on occurrences in one recurring request (a year of twice-weekly sessions is ~104).
+RECURRING_MAX_OCCURRENCES = 200
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """A weekly pattern in the facility's local time, e.g. Mon/Wed 06:00-08:00 until a date."""
+
+    weekdays: FrozenSet[str]  # open_hours keys, "mon" .. "sun"
+    start_time: time
+    end_time: time
+    start_date: date
+    end_date: date  # inclusive
+
+    def occurrences(self, timezone: str) -> List[Interval]:
+        """Expand to UTC intervals in date order."""
+        if self.end_time <= self.start_time:
+            raise ValueError("Recurring slot must end after it starts")
+        tz = pytz.timezone(timezone)
+        found: List[Interval] = []
+        day = self.start_date
+        while day <= self.end_date:
+            if WEEKDAY_KEYS[day.weekday()] in self.weekdays:
+                start = tz.localize(datetime.combine(day, self.start_time))
+                end = tz.localize(datetime.combine(day, self.end_time))
+                found.append((start.astimezone(pytz.UTC), end.astimezone(pytz.UTC)))
+                if len(found) > RECURRING_MAX_OCCURRENCES:
+                    raise ValueError(f"Recurring bookings are limited to {RECURRING_MAX_OCCURRENCES} occurrences")
+            day += timedelta(days=1)
+        return found
+
+
+@dataclass
+class RecurringBookingResult:
+    booked: List[Booking]  # one per court per bookable occurrence, not yet committed
+    conflicts: List[Interval]  # occurrences with fewer than the requested courts free
+
+    @property
+    def occurrences(self) -> int:
+        return len({booking.start_time for booking in self.booked}) + len(self.conflicts)
+
+
+async def create_recurring_booking(
+    session: AsyncSession,
+    facility_id: UUID,
+    customer_name: str,
+    customer_phone: str,
+    recurrence: Recurrence,
+    courts: int = 1,
+    dry_run: bool = False,
+) -> RecurringBookingResult:
+    """Book every free occurrence of ``recurrence`` in one transaction.
+
+    The facility and customer are looked up once, every occurrence is
+    checked against one calendar fetch and one range query over existing
+    bookings, and the bookings and their calendar outbox rows go in with
+    one bulk INSERT each. Occurrences without ``courts`` free courts are
+    returned as conflicts rather than failing the request; with
+    ``dry_run`` nothing is written and ``booked`` shows what would be.
+    """
+    facility_data = await get_facility_with_config(session, facility_id)
+    facility = facility_data.facility
+    if courts < 1 or courts > facility_data.config.max_courts:
+        raise ValueError(f"Between 1 and {facility_data.config.max_courts} courts can be booked at once")
+    now = datetime.now(pytz.UTC)
+    occurrences = [slot for slot in recurrence.occurrences(facility.timezone) if slot[0] >= now]
+    if not occurrences:
+        return RecurringBookingResult(booked=[], conflicts=[])
+    range_start, range_end = occurrences[0][0], occurrences[-1][1]
+
+    busy = await _fetch_busy(facility_data, range_start, range_end)
+    if not dry_run:
+        await _lock_facility_bookings(session, facility.id)
+    # Existing bookings across the whole range in one query. Those not on the calendars yet
+    # take capacity like in create_booking; all of them are laid on a second grid that, as
+    # in _assign_court, decides which courts are taken.
+    existing = await _fetch_bookings(session, facility.id, range_start, range_end)
+    _add_bookings(facility_data, busy, existing)
+    occupancy = _occupancy_for(facility_data, occurrences, busy)
+    taken = CourtOccupancy(occurrences, occupancy.lanes)
+    lane_of = {court_id: idx for idx, court_id in enumerate(occupancy.lanes) if court_id is not None}
+    by_lane: Dict[int, List[Interval]] = {}
+    unassigned: List[Interval] = []
+    for booking in existing:
+        lane = lane_of.get(booking.court_id)
+        if lane is None:
+            unassigned.append((booking.start_time, booking.end_time))
+        else:
+            by_lane.setdefault(lane, []).append((booking.start_time, booking.end_time))
+    taken.add_shared_busy(unassigned)
+    for lane, intervals in by_lane.items():
+        taken.add_court_busy(lane, intervals)
+    unnamed = [idx for idx, court_id in enumerate(occupancy.lanes) if court_id is None]
+
+    if dry_run:
+        # Nothing is written on a dry run, not even the customer.
+        customer = (
+            await session.execute(
+                select(Customer).where(Customer.facility_id == facility_id, Customer.phone == customer_phone)
+            )
+        ).scalar_one_or_none()
+    else:
+        customer = await upsert_customer(session, facility_id, customer_name, customer_phone)
+    court_calendars = _court_calendar_ids(facility_data)
+    tz = pytz.timezone(facility.timezone)
+    booked: List[Booking] = []
+    conflicts: List[Interval] = []
+    free_counts = occupancy.free_counts()
+    for idx, ((start, end), free) in enumerate(zip(occupancy.slots, free_counts)):
+        lanes: List[int] = []
+        if free >= courts:
+            exclude = [int(lane) for lane in np.flatnonzero(taken.court_busy[:, idx])]
+            # Bookings without a court each occupy one of the unnamed courts.
+            exclude.extend(unnamed[: int(taken.shared_busy[idx])])
+            for _ in range(courts):
+                lane = occupancy.free_court(start, end, exclude=exclude + lanes)
+                if lane is None:
+                    break
+                lanes.append(lane)
+        if len(lanes) < courts:
+            conflicts.append((start, end))
+            continue
+        for lane in lanes:
+            court = facility_data.lanes[lane]
+            booked.append(
+                Booking(
+                    id=uuid.uuid4(),
+                    facility_id=facility.id,
+                    court_id=court.id if court else None,
+                    customer_id=customer.id if customer else None,
+                    start_time=start,
+                    end_time=end,
+                    status="confirmed",
+                    price=_as_price(facility_data.price(start.astimezone(tz), end.astimezone(tz), court)),
+                    source="phone_ai",
+                )
+            )
+    if dry_run or not booked:
+        return RecurringBookingResult(booked=booked, conflicts=conflicts)
+
+    created_at = datetime.utcnow()
+    try:
+        async with session.begin_nested():
+            await session.execute(
+                insert(Booking),
+                [
+                    {
+                        "id": booking.id,
+                        "facility_id": booking.facility_id,
+                        "court_id": booking.court_id,
+                        "customer_id": booking.customer_id,
+                        "start_time": booking.start_time,
+                        "end_time": booking.end_time,
+                        "status": booking.status,
+                        "price": booking.price,
+                        "source": booking.source,
+                        "created_at": created_at,
+                    }
+                    for booking in booked
+                ],
+            )
+    except IntegrityError as exc:
+        # Only a booking written outside the facility lock can get here; the
+        # series is all-or-nothing at this point, so report the whole range.
+        if getattr(exc.orig, "sqlstate", None) == EXCLUSION_VIOLATION:
+            raise SlotTakenError(range_start, range_end) from exc
+        raise
+
+    lane_calendar = {
+        court.id: court_calendars[idx] for idx, court in enumerate(facility_data.lanes) if idx in court_calendars
+    }
+    events = [
+        (
+            booking.id,
+            lane_calendar.get(booking.court_id) or _facility_calendar_id(facility),
+            booking.start_time,
+            booking.end_time,
+        )
+        for booking in booked
+    ]
+    await enqueue_calendar_events(
+        session,
+        events,
+        summary=f"Badminton booking - {customer.name or customer.phone} (recurring)",
+        description="Created via AI receptionist",
+    )
+    run_after_commit(session, lambda: _series_committed(events))
+    return RecurringBookingResult(booked=booked, conflicts=conflicts)
+
+
+def _series_committed(events: Sequence[Tuple[UUID, str, datetime, datetime]]) -> None:
+    for booking_id, calendar_id, start, end in events:
+        busy_store.record_event(calendar_id, event_id_for(booking_id), start, end)
+    outbox_worker.notify()
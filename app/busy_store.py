@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import pytz
+
+from app import calendar_client
+from app.calendar_client import EventPage, SyncTokenExpired
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+Interval = Tuple[datetime, datetime]
+
+
+class CalendarBackend(Protocol):
+    async def list_events(
+        self,
+        calendar_id: str,
+        sync_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+        time_max: Optional[datetime] = None,
+    ) -> EventPage:
+        ...
+
+    async def freebusy(
+        self, calendar_ids: Sequence[str], time_min: datetime, time_max: datetime
+    ) -> Dict[str, List[Interval]]:
+        ...
+
+
+@dataclass
+class _CalendarState:
+    events: Dict[str, Interval] = field(default_factory=dict)
+    sync_token: Optional[str] = None
+    window: Optional[Interval] = None
+    synced_at: Optional[float] = None
+    full_synced_at: Optional[float] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    refresh_task: Optional[asyncio.Task] = None
+    # Sorted (start, end, event id) view of ``events`` for range reads; rebuilt lazily after changes.
+    _starts: List[datetime] = field(default_factory=list)
+    _sorted: List[Tuple[datetime, datetime, str]] = field(default_factory=list)
+    _max_length: timedelta = timedelta(0)
+    _dirty: bool = True
+
+    def put(self, event_id: str, interval: Interval) -> None:
+        self.events[event_id] = interval
+        self._dirty = True
+
+    def clear(self) -> None:
+        self.events.clear()
+        self._dirty = True
+
+    def discard(self, event_id: str) -> None:
+        if self.events.pop(event_id, None) is not None:
+            self._dirty = True
+
+    def between(self, start: datetime, end: datetime) -> List[Tuple[str, Interval]]:
+        if self._dirty:
+            self._sorted = sorted((s, e, event_id) for event_id, (s, e) in self.events.items())
+            self._starts = [entry[0] for entry in self._sorted]
+            self._max_length = max((e - s for s, e, _ in self._sorted), default=timedelta(0))
+            self._dirty = False
+        idx = bisect_left(self._starts, start - self._max_length)
+        result: List[Tuple[str, Interval]] = []
+        for busy_start, busy_end, event_id in self._sorted[idx:]:
+            if busy_start >= end:
+                break
+            if busy_end > start:
+                result.append((event_id, (busy_start, busy_end)))
+        return result
+
+
+@dataclass
+class BusyStoreStats:
+    reads: int = 0
+    fallback_reads: int = 0
+    full_syncs: int = 0
+    incremental_syncs: int = 0
+    sync_errors: int = 0
+    local_writes: int = 0
+
+
+class BusyIntervalStore:
+    """In-memory busy intervals per calendar, kept current by incremental sync.
+
+    The first read of a calendar does a full event listing over a rolling
+    window; after that reads are served from memory. Once data is older
+    than ``sync_interval`` a read schedules an incremental (sync token)
+    refresh in the background and still answers from memory; only data
+    older than ``max_staleness`` makes the read wait for the sync. Reads
+    outside the synced window fall back to a direct free/busy query, one
+    per read however many calendars it covers.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CalendarBackend] = None,
+        sync_interval: float = 30.0,
+        max_staleness: float = 300.0,
+        full_resync_interval: float = 6 * 3600.0,
+        window_days: int = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._backend = backend
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.full_resync_interval = full_resync_interval
+        self.window_days = window_days
+        self.stats = BusyStoreStats()
+        self._clock = clock
+        self._calendars: Dict[str, _CalendarState] = {}
+
+    @property
+    def backend(self) -> CalendarBackend:
+        return self._backend or calendar_client.get_calendar_client()
+
+    def staleness(self, calendar_id: str) -> Optional[float]:
+        """Seconds since the calendar was last synced, or None if never synced."""
+        state = self._calendars.get(calendar_id)
+        if state is None or state.synced_at is None:
+            return None
+        return self._clock() - state.synced_at
+
+    def staleness_by_calendar(self) -> Dict[str, Optional[float]]:
+        return {calendar_id: self.staleness(calendar_id) for calendar_id in self._calendars}
+
+    async def busy_between(self, calendar_id: str, start: datetime, end: datetime) -> List[Interval]:
+        return [interval for _, interval in await self.busy_events_between(calendar_id, start, end)]
+
+    async def busy_events_between(
+        self, calendar_id: str, start: datetime, end: datetime
+    ) -> List[Tuple[Optional[str], Interval]]:
+        """Busy intervals with their event ids; the id is None on free/busy fallback reads, which carry none."""
+        return (await self.busy_events_for([calendar_id], start, end))[calendar_id]
+
+    async def busy_events_for(
+        self, calendar_ids: Sequence[str], start: datetime, end: datetime
+    ) -> Dict[str, List[Tuple[Optional[str], Interval]]]:
+        """``busy_events_between`` for several calendars, keyed by calendar id.
+
+        Calendars synced over the range are answered from memory; all the
+        others share a single free/busy query.
+        """
+        states = {calendar_id: self._calendars.setdefault(calendar_id, _CalendarState()) for calendar_id in calendar_ids}
+        await asyncio.gather(*(self._ensure_fresh(calendar_id, state) for calendar_id, state in states.items()))
+        result: Dict[str, List[Tuple[Optional[str], Interval]]] = {}
+        fallback: List[str] = []
+        for calendar_id, state in states.items():
+            self.stats.reads += 1
+            if state.window is None or start < state.window[0] or end > state.window[1]:
+                self.stats.fallback_reads += 1
+                fallback.append(calendar_id)
+            else:
+                result[calendar_id] = state.between(start, end)
+        if fallback:
+            busy = await self.backend.freebusy(fallback, start, end)
+            for calendar_id in fallback:
+                result[calendar_id] = [(None, interval) for interval in busy.get(calendar_id, [])]
+        return result
+
+    def record_event(self, calendar_id: str, event_id: str, start: datetime, end: datetime) -> None:
+        """Apply a locally created event without waiting for the next sync."""
+        state = self._calendars.get(calendar_id)
+        if state is None or state.synced_at is None:
+            # Not loaded yet; the first full sync will pick the event up.
+            return
+        state.put(event_id, (start.astimezone(pytz.UTC), end.astimezone(pytz.UTC)))
+        self.stats.local_writes += 1
+
+    def invalidate(self, calendar_id: Optional[str] = None) -> None:
+        if calendar_id is None:
+            self._calendars.clear()
+        else:
+            self._calendars.pop(calendar_id, None)
+
+    async def _ensure_fresh(self, calendar_id: str, state: _CalendarState) -> None:
+        now = self._clock()
+        if state.synced_at is not None:
+            age = now - state.synced_at
+            if age < self.sync_interval:
+                return
+            if age < self.max_staleness:
+                if state.refresh_task is None or state.refresh_task.done():
+                    state.refresh_task = asyncio.create_task(self._sync_quietly(calendar_id, state))
+                return
+        await self._sync(calendar_id, state)
+
+    async def _sync_quietly(self, calendar_id: str, state: _CalendarState) -> None:
+        try:
+            await self._sync(calendar_id, state)
+        except Exception:
+            logger.exception("Background sync failed for calendar %s", calendar_id)
+
+    async def _sync(self, calendar_id: str, state: _CalendarState) -> None:
+        async with state.lock:
+            started = self._clock()
+            if state.synced_at is not None and started - state.synced_at < self.sync_interval:
+                return  # Another reader synced while we waited for the lock.
+            try:
+                full_due = (
+                    state.sync_token is None
+                    or state.full_synced_at is None
+                    or started - state.full_synced_at >= self.full_resync_interval
+                )
+                if not full_due:
+                    try:
+                        await self._incremental_sync(calendar_id, state)
+                    except SyncTokenExpired:
+                        full_due = True
+                if full_due:
+                    await self._full_sync(calendar_id, state)
+            except Exception:
+                self.stats.sync_errors += 1
+                raise
+            state.synced_at = started
+
+    async def _full_sync(self, calendar_id: str, state: _CalendarState) -> None:
+        now = datetime.now(pytz.UTC)
+        window = (now - timedelta(days=1), now + timedelta(days=self.window_days))
+        page = await self.backend.list_events(calendar_id, time_min=window[0], time_max=window[1])
+        state.clear()
+        for event in page.events:
+            if not event.cancelled:
+                state.put(event.id, (event.start.astimezone(pytz.UTC), event.end.astimezone(pytz.UTC)))
+        state.sync_token = page.next_sync_token
+        state.window = window
+        state.full_synced_at = self._clock()
+        self.stats.full_syncs += 1
+
+    async def _incremental_sync(self, calendar_id: str, state: _CalendarState) -> None:
+        page = await self.backend.list_events(calendar_id, sync_token=state.sync_token)
+        for event in page.events:
+            if event.cancelled:
+                state.discard(event.id)
+            else:
+                state.put(event.id, (event.start.astimezone(pytz.UTC), event.end.astimezone(pytz.UTC)))
+        state.sync_token = page.next_sync_token or state.sync_token
+        self.stats.incremental_syncs += 1
+
+
+busy_store = BusyIntervalStore(
+    sync_interval=settings.busy_store_sync_seconds,
+    max_staleness=settings.busy_store_max_staleness_seconds,
+    window_days=settings.busy_store_window_days,
+)
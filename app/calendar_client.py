@@ -1,32 +1,308 @@
 from __future__ import annotations
 
+import asyncio
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
 
-# TODO: Integrate google-auth and google-api-python-client with OAuth2 tokens.
-# For now, this module provides stubbed implementations that should be replaced
-# with real calendar interactions.
+import httpx
+import pytz
 
+from app import metrics
+from app.config import get_settings
 
-def get_busy_intervals(calendar_id: str, day_start: datetime, day_end: datetime) -> List[Tuple[datetime, datetime]]:
-    """Return busy intervals for the day.
+settings = get_settings()
 
-    Replace this stub with Google Calendar free/busy query using stored credentials.
+GOOGLE_CALENDAR_BASE_URL = "https://www.googleapis.com/calendar/v3"
+CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+# Google rejects freeBusy queries for more than 50 calendars at once.
+FREEBUSY_MAX_CALENDARS = 50
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+Interval = Tuple[datetime, datetime]
+
+
+class CalendarError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SyncTokenExpired(CalendarError):
+    """The sync token is no longer valid; the caller must do a full sync."""
+
+
+@dataclass
+class CalendarEvent:
+    id: str
+    start: datetime
+    end: datetime
+    cancelled: bool = False
+
+
+@dataclass
+class EventPage:
+    events: List[CalendarEvent] = field(default_factory=list)
+    next_sync_token: Optional[str] = None
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _parse_event_time(value: Dict[str, str], tz: pytz.BaseTzInfo) -> datetime:
+    if "dateTime" in value:
+        return _parse_time(value["dateTime"])
+    # All-day events carry a bare date in the calendar's timezone.
+    return tz.localize(datetime.fromisoformat(value["date"]))
+
+
+def _parse_event(item: Dict[str, Any], tz: pytz.BaseTzInfo) -> CalendarEvent:
+    if item.get("status") == "cancelled" or item.get("transparency") == "transparent":
+        # Cancelled events may only carry an id; transparent ones never block time.
+        return CalendarEvent(id=item["id"], start=datetime.min, end=datetime.min, cancelled=True)
+    return CalendarEvent(
+        id=item["id"], start=_parse_event_time(item["start"], tz), end=_parse_event_time(item["end"], tz)
+    )
+
+
+class CalendarClient:
+    """Async Google Calendar client sharing one pooled ``httpx.AsyncClient``.
+
+    Without credentials or a base URL override the client runs in stub mode
+    (no busy time, placeholder event ids) so local development needs no
+    Google account. Point ``base_url`` at a fake server to exercise the HTTP
+    path offline.
     """
-    # Example stub returning no busy intervals.
-    return []
 
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        credentials_path: Optional[str] = None,
+        timeout: float = 5.0,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.2,
+        max_connections: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.stubbed = not base_url and not credentials_path and transport is None
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._credentials_path = credentials_path
+        self._credentials = None
+        self._credentials_lock = asyncio.Lock()
+        self._http = httpx.AsyncClient(
+            base_url=base_url or GOOGLE_CALENDAR_BASE_URL,
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        if not self._credentials_path:
+            return {}
+        async with self._credentials_lock:
+            if self._credentials is None:
+                from google.oauth2 import service_account
+
+                self._credentials = service_account.Credentials.from_service_account_file(
+                    self._credentials_path, scopes=CALENDAR_SCOPES
+                )
+            if not self._credentials.valid:
+                from google.auth.transport.requests import Request
+
+                # google-auth refreshes synchronously; keep it off the event loop.
+                await asyncio.to_thread(self._credentials.refresh, Request())
+        return {"Authorization": f"Bearer {self._credentials.token}"}
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            return await self._request_with_retries(method, path, **kwargs)
+        finally:
+            metrics.add_calendar_time(time.perf_counter() - started)
+
+    async def _request_with_retries(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        headers = await self._auth_headers()
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.request(method, path, headers=headers, **kwargs)
+            except httpx.TransportError as exc:
+                if attempt >= self.max_retries:
+                    raise CalendarError(f"Calendar request failed: {exc}") from exc
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    if response.status_code == 410:
+                        raise SyncTokenExpired("Calendar sync token expired", status_code=410)
+                    if response.is_error:
+                        raise CalendarError(
+                            f"Calendar API returned {response.status_code}: {response.text}",
+                            status_code=response.status_code,
+                        )
+                    return response.json() if response.content else {}
+            delay = self.backoff_seconds * (2**attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+            attempt += 1
 
-def create_event(
+    async def freebusy(
+        self, calendar_ids: Sequence[str], time_min: datetime, time_max: datetime
+    ) -> Dict[str, List[Interval]]:
+        """Return busy intervals for many calendars with one freeBusy query per 50 calendars."""
+        unique_ids = list(dict.fromkeys(calendar_ids))
+        if self.stubbed or not unique_ids:
+            return {calendar_id: [] for calendar_id in unique_ids}
+
+        chunks = [
+            unique_ids[i : i + FREEBUSY_MAX_CALENDARS] for i in range(0, len(unique_ids), FREEBUSY_MAX_CALENDARS)
+        ]
+        responses = await asyncio.gather(
+            *(
+                self._request(
+                    "POST",
+                    "/freeBusy",
+                    json={
+                        "timeMin": time_min.isoformat(),
+                        "timeMax": time_max.isoformat(),
+                        "items": [{"id": calendar_id} for calendar_id in chunk],
+                    },
+                )
+                for chunk in chunks
+            )
+        )
+
+        busy: Dict[str, List[Interval]] = {}
+        for data in responses:
+            for calendar_id, entry in data.get("calendars", {}).items():
+                if entry.get("errors"):
+                    raise CalendarError(f"freeBusy failed for {calendar_id}: {entry['errors']}")
+                busy[calendar_id] = [(_parse_time(b["start"]), _parse_time(b["end"])) for b in entry.get("busy", [])]
+        for calendar_id in unique_ids:
+            busy.setdefault(calendar_id, [])
+        return busy
+
+    async def get_busy_intervals(self, calendar_id: str, day_start: datetime, day_end: datetime) -> List[Interval]:
+        result = await self.freebusy([calendar_id], day_start, day_end)
+        return result[calendar_id]
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        sync_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+        time_max: Optional[datetime] = None,
+    ) -> EventPage:
+        """List events, either a full window or the changes since ``sync_token``.
+
+        Follows pagination and returns the ``nextSyncToken`` from the last page.
+        Raises ``SyncTokenExpired`` when Google asks for a full resync.
+        """
+        if self.stubbed:
+            return EventPage(next_sync_token="stub")
+        params: Dict[str, Any] = {"singleEvents": "true", "maxResults": 2500}
+        if sync_token:
+            params["syncToken"] = sync_token
+        else:
+            if time_min:
+                params["timeMin"] = time_min.isoformat()
+            if time_max:
+                params["timeMax"] = time_max.isoformat()
+
+        page = EventPage()
+        path = f"/calendars/{quote(calendar_id, safe='')}/events"
+        while True:
+            data = await self._request("GET", path, params=params)
+            tz = pytz.timezone(data.get("timeZone") or "UTC")
+            page.events.extend(_parse_event(item, tz) for item in data.get("items", []))
+            if not data.get("nextPageToken"):
+                page.next_sync_token = data.get("nextSyncToken")
+                return page
+            params["pageToken"] = data["nextPageToken"]
+
+    async def create_event(
+        self,
+        calendar_id: str,
+        summary: str,
+        start: datetime,
+        end: datetime,
+        description: str | None = None,
+        event_id: str | None = None,
+    ) -> str:
+        """Create an event and return its id.
+
+        With ``event_id`` the call is idempotent: Google rejects a second
+        insert with the same id (409), which is treated as success.
+        """
+        if self.stubbed:
+            # Unique so the busy store does not collapse stubbed events onto one id.
+            return event_id or f"stubbed-{uuid.uuid4().hex}"
+        body: Dict[str, Any] = {
+            "summary": summary,
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": end.isoformat()},
+        }
+        if description:
+            body["description"] = description
+        if event_id:
+            body["id"] = event_id
+        try:
+            data = await self._request("POST", f"/calendars/{quote(calendar_id, safe='')}/events", json=body)
+        except CalendarError as exc:
+            if event_id and exc.status_code == 409:
+                return event_id
+            raise
+        return data["id"]
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+_client: Optional[CalendarClient] = None
+
+
+def get_calendar_client() -> CalendarClient:
+    global _client
+    if _client is None:
+        _client = CalendarClient(
+            base_url=settings.google_calendar_base_url,
+            credentials_path=settings.google_credentials_path,
+            timeout=settings.calendar_timeout_seconds,
+            max_retries=settings.calendar_max_retries,
+            backoff_seconds=settings.calendar_backoff_seconds,
+            max_connections=settings.calendar_max_connections,
+        )
+    return _client
+
+
+async def close_calendar_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def freebusy(calendar_ids: Sequence[str], time_min: datetime, time_max: datetime) -> Dict[str, List[Interval]]:
+    return await get_calendar_client().freebusy(calendar_ids, time_min, time_max)
+
+
+async def get_busy_intervals(calendar_id: str, day_start: datetime, day_end: datetime) -> List[Interval]:
+    """Return busy intervals for the day."""
+    return await get_calendar_client().get_busy_intervals(calendar_id, day_start, day_end)
+
+
+async def create_event(
     calendar_id: str,
     summary: str,
     start: datetime,
     end: datetime,
     description: str | None = None,
+    event_id: str | None = None,
 ) -> str:
-    """Create an event and return the Google event ID.
-
-    TODO: implement Google Calendar event creation with OAuth2 credentials.
-    """
-    # Stubbed event id
-    return "stubbed-google-event-id"
+    """Create an event and return the Google event ID."""
+    return await get_calendar_client().create_event(
+        calendar_id, summary, start, end, description=description, event_id=event_id
+    )
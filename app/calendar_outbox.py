@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import calendar_client
+from app.config import get_settings
+from app.db import SessionLocal
+from app.models import Booking, CalendarOutbox
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def event_id_for_booking(booking: Booking) -> str:
+    return event_id_for(booking.id)
+
+
+def event_id_for(booking_id: UUID) -> str:
+    # Google event ids use base32hex (a-v, 0-9), which a UUID's hex digits satisfy.
+    return booking_id.hex
+
+
+def enqueue_calendar_event(
+    session: AsyncSession,
+    booking: Booking,
+    calendar_id: str,
+    summary: str,
+    description: Optional[str] = None,
+) -> CalendarOutbox:
+    """Stage the calendar write for ``booking`` in the caller's transaction."""
+    entry = CalendarOutbox(
+        booking_id=booking.id,
+        calendar_id=calendar_id,
+        idempotency_key=event_id_for_booking(booking),
+        payload={
+            "summary": summary,
+            "description": description,
+            "start": booking.start_time.isoformat(),
+            "end": booking.end_time.isoformat(),
+        },
+    )
+    session.add(entry)
+    return entry
+
+
+async def enqueue_calendar_events(
+    session: AsyncSession,
+    events: Sequence[Tuple[UUID, str, datetime, datetime]],
+    summary: str,
+    description: Optional[str] = None,
+) -> None:
+    """Stage calendar writes for many bookings with one INSERT.
+
+    ``events`` holds (booking id, calendar id, start, end); the worker then
+    delivers them ``batch_size`` at a time.
+    """
+    if not events:
+        return
+    await session.execute(
+        insert(CalendarOutbox),
+        [
+            {
+                "booking_id": booking_id,
+                "calendar_id": calendar_id,
+                "idempotency_key": event_id_for(booking_id),
+                "payload": {
+                    "summary": summary,
+                    "description": description,
+                    "start": start.isoformat(),
+                    "end": end.isoformat(),
+                },
+            }
+            for booking_id, calendar_id, start, end in events
+        ],
+    )
+
+
+class CalendarOutboxWorker:
+    """Drain ``calendar_outbox`` in batches and create the Google events.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers can
+    run side by side. Failed deliveries back off exponentially and are
+    retried with the same event id, so a retry after a lost response does
+    not create a duplicate event.
+    """
+
+    def __init__(self, batch_size: int, poll_interval: float, max_attempts: int, backoff_seconds: float):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.delivered = 0
+        self.failed = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        """Wake the worker early, e.g. right after a booking commits."""
+        self._wake.set()
+
+    async def _deliver(self, entry: CalendarOutbox) -> str:
+        payload = entry.payload
+        return await calendar_client.create_event(
+            calendar_id=entry.calendar_id,
+            summary=payload["summary"],
+            start=datetime.fromisoformat(payload["start"]),
+            end=datetime.fromisoformat(payload["end"]),
+            description=payload.get("description"),
+            event_id=entry.idempotency_key,
+        )
+
+    async def drain_once(self) -> int:
+        """Process one batch; return the number of rows attempted."""
+        now = datetime.utcnow()
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(CalendarOutbox)
+                .where(
+                    CalendarOutbox.processed_at.is_(None),
+                    CalendarOutbox.attempts < self.max_attempts,
+                    CalendarOutbox.next_attempt_at <= now,
+                )
+                .order_by(CalendarOutbox.created_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            entries = result.scalars().all()
+            if not entries:
+                return 0
+
+            outcomes = await asyncio.gather(*(self._deliver(entry) for entry in entries), return_exceptions=True)
+            for entry, outcome in zip(entries, outcomes):
+                entry.attempts += 1
+                if isinstance(outcome, BaseException):
+                    entry.last_error = str(outcome)[:1000]
+                    entry.next_attempt_at = now + timedelta(seconds=self.backoff_seconds * 2 ** (entry.attempts - 1))
+                    self.failed += 1
+                    logger.warning("Calendar outbox delivery failed for booking %s: %s", entry.booking_id, outcome)
+                    continue
+                entry.processed_at = now
+                entry.last_error = None
+                await session.execute(
+                    update(Booking).where(Booking.id == entry.booking_id).values(google_event_id=outcome)
+                )
+                self.delivered += 1
+            await session.commit()
+            return len(entries)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.drain_once()
+            except Exception:
+                logger.exception("Calendar outbox drain failed")
+                processed = 0
+            if processed >= self.batch_size:
+                continue
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+outbox_worker = CalendarOutboxWorker(
+    batch_size=settings.calendar_outbox_batch_size,
+    poll_interval=settings.calendar_outbox_poll_seconds,
+    max_attempts=settings.calendar_outbox_max_attempts,
+    backoff_seconds=settings.calendar_outbox_backoff_seconds,
+)
@@ -1,16 +1,78 @@
+import time
+from typing import Callable
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
 
+from app import metrics
 from app.config import get_settings
+from app.utils import codec
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, echo=False, future=True)
+# Calls hold no connection between tool invocations (each tool opens its own
+# session), so a small pool serves many concurrent calls.
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    future=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    # JSONB values (tool results, event data) may carry datetimes and UUIDs.
+    json_serializer=codec.dumps,
+    json_deserializer=codec.loads,
+)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 Base = declarative_base()
 
 
+# Start times keyed by execution context, so a statement that fails between the two
+# events cannot shift the timings of later statements on the same connection.
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", {})[context] = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop(context, None)
+    if started is not None:
+        metrics.add_db_time(time.perf_counter() - started)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _drop_query_timer(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None:
+        conn.info.get("query_started", {}).pop(exception_context.execution_context, None)
+
+
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
+
+
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction commits; drop it on rollback."""
+    session.sync_session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_after_commit_callbacks(session: Session, previous_transaction) -> None:
+    # A rolled-back savepoint (begin_nested) leaves the outer transaction, and its callbacks, alive.
+    if previous_transaction.parent is None:
+        session.info.pop(_AFTER_COMMIT_KEY, None)
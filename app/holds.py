@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import heapq
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+Interval = Tuple[datetime, datetime]
+
+
+@dataclass
+class SlotHold:
+    id: UUID
+    facility_id: UUID
+    start: datetime
+    end: datetime
+    expires_at: float
+
+
+class HoldRegistry:
+    """Short-lived, in-process slot holds with heap-ordered expiry.
+
+    Expired holds are evicted lazily from a min-heap keyed by expiry time
+    whenever the registry is touched, so there is no periodic scan. Holds
+    live in this process only; with several workers a hold protects the
+    slot from callers served by the same worker, while the booking path's
+    DB checks remain the final word.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._holds: Dict[UUID, SlotHold] = {}
+        self._by_facility: Dict[UUID, Dict[UUID, SlotHold]] = {}
+        self._expiry: List[Tuple[float, UUID]] = []
+        self.placed = 0
+        self.expired = 0
+        self.converted = 0
+
+    def __len__(self) -> int:
+        self._evict_expired()
+        return len(self._holds)
+
+    def _evict_expired(self) -> None:
+        now = self._clock()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, hold_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(hold_id)
+            # Released holds leave stale heap entries behind; skip them.
+            if hold is not None and hold.expires_at == expires_at:
+                self._remove(hold)
+                self.expired += 1
+
+    def _remove(self, hold: SlotHold) -> None:
+        self._holds.pop(hold.id, None)
+        facility_holds = self._by_facility.get(hold.facility_id)
+        if facility_holds is not None:
+            facility_holds.pop(hold.id, None)
+            if not facility_holds:
+                del self._by_facility[hold.facility_id]
+
+    def place(
+        self,
+        facility_id: UUID,
+        start: datetime,
+        end: datetime,
+        ttl_seconds: float,
+        capacity: Optional[int] = None,
+    ) -> Optional[SlotHold]:
+        """Hold [start, end); None if ``capacity`` holds already overlap it.
+
+        ``capacity`` is the number of courts free for the slot before any
+        holds. The check and the insert run without yielding to the event
+        loop, so concurrent callers cannot both take the last court.
+        """
+        self._evict_expired()
+        if capacity is not None:
+            overlapping = sum(
+                1 for hold in self._by_facility.get(facility_id, {}).values() if hold.start < end and hold.end > start
+            )
+            if overlapping >= capacity:
+                return None
+        hold = SlotHold(
+            id=uuid.uuid4(),
+            facility_id=facility_id,
+            start=start,
+            end=end,
+            expires_at=self._clock() + ttl_seconds,
+        )
+        self._holds[hold.id] = hold
+        self._by_facility.setdefault(facility_id, {})[hold.id] = hold
+        heapq.heappush(self._expiry, (hold.expires_at, hold.id))
+        self.placed += 1
+        return hold
+
+    def get(self, hold_id: UUID) -> Optional[SlotHold]:
+        self._evict_expired()
+        return self._holds.get(hold_id)
+
+    def release(self, hold_id: UUID, converted: bool = False) -> Optional[SlotHold]:
+        self._evict_expired()
+        hold = self._holds.get(hold_id)
+        if hold is not None:
+            self._remove(hold)
+            if converted:
+                self.converted += 1
+        return hold
+
+    def intervals(self, facility_id: UUID, exclude: Optional[UUID] = None) -> List[Interval]:
+        """Return held intervals for a facility, optionally ignoring one hold."""
+        self._evict_expired()
+        return [
+            (hold.start, hold.end)
+            for hold in self._by_facility.get(facility_id, {}).values()
+            if hold.id != exclude
+        ]
+
+    def seconds_left(self, hold: SlotHold) -> float:
+        return max(0.0, hold.expires_at - self._clock())
+
+
+slot_holds = HoldRegistry()
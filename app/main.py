@@ -1,24 +1,67 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from datetime import datetime
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.booking_service import check_availability, create_booking
+from app import metrics
+from app.ai.realtime_pool import realtime_pool
+from app.booking_service import (
+    Recurrence,
+    SlotSearch,
+    SlotTakenError,
+    check_availability,
+    create_booking,
+    create_recurring_booking,
+    find_next_available,
+)
+from app.calendar_client import close_calendar_client
+from app.calendar_outbox import outbox_worker
+from app.config import get_settings
 from app.db import get_session
 from app.schemas import (
     AvailabilityRequest,
     AvailabilityResponse,
+    AvailabilitySearchRequest,
     BookingRequest,
     BookingResponse,
     HealthResponse,
+    RecurringBookingRequest,
+    RecurringBookingResponse,
 )
 from app.schemas import SlotOption
+from app.telephony.call_log import call_events, call_log
+from app.telephony.caller_context import caller_prefetcher
+from app.telephony.routing import routing_table
 from app.telephony.twilio_webhook import router as twilio_router
 from app.telephony.twilio_media import router as twilio_media_router
 
-app = FastAPI(title="AI Receptionist Backend")
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await routing_table.start(settings.routing_refresh_seconds)
+    call_log.start()
+    call_events.start()
+    outbox_worker.start()
+    realtime_pool.start()
+    try:
+        yield
+    finally:
+        await routing_table.stop()
+        await caller_prefetcher.stop()
+        await call_events.stop()
+        await call_log.stop()
+        await outbox_worker.stop()
+        await realtime_pool.stop()
+        await close_calendar_client()
+
+
+app = FastAPI(title="AI Receptionist Backend", lifespan=lifespan)
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -26,6 +69,11 @@ async def health() -> HealthResponse:
     return HealthResponse(status="ok")
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/availability", response_model=AvailabilityResponse)
 async def availability(
     payload: AvailabilityRequest,
@@ -35,21 +83,89 @@ async def availability(
     return AvailabilityResponse(slots=slots)
 
 
+@app.post("/availability/search", response_model=AvailabilityResponse)
+async def availability_search(
+    payload: AvailabilitySearchRequest,
+    session: AsyncSession = Depends(get_session),
+) -> AvailabilityResponse:
+    search = SlotSearch(
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        earliest=payload.earliest,
+        latest=payload.latest,
+        weekdays=frozenset(day.lower()[:3] for day in payload.weekdays) if payload.weekdays else None,
+        duration_minutes=payload.duration_minutes,
+        courts=payload.courts,
+    )
+    try:
+        slots = await find_next_available(session, payload.facility_id, search, payload.limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return AvailabilityResponse(slots=slots)
+
+
 @app.post("/book", response_model=BookingResponse)
 async def book(
     payload: BookingRequest,
     session: AsyncSession = Depends(get_session),
 ) -> BookingResponse:
     slot_option = SlotOption(start=payload.start, end=payload.end)
-    booking = await create_booking(
-        session,
-        facility_id=payload.facility_id,
-        customer_name=payload.customer_name,
-        customer_phone=payload.customer_phone,
-        slot=slot_option,
-    )
+    try:
+        booking = await create_booking(
+            session,
+            facility_id=payload.facility_id,
+            customer_name=payload.customer_name,
+            customer_phone=payload.customer_phone,
+            slot=slot_option,
+        )
+    except SlotTakenError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     await session.commit()
-    return BookingResponse(booking_id=booking.id, start=booking.start_time, end=booking.end_time)
+    return BookingResponse(
+        booking_id=booking.id,
+        start=booking.start_time,
+        end=booking.end_time,
+        court_id=booking.court_id,
+        price=booking.price,
+    )
+
+
+@app.post("/book/recurring", response_model=RecurringBookingResponse)
+async def book_recurring(
+    payload: RecurringBookingRequest,
+    session: AsyncSession = Depends(get_session),
+) -> RecurringBookingResponse:
+    recurrence = Recurrence(
+        weekdays=frozenset(day.lower()[:3] for day in payload.weekdays),
+        start_time=payload.start_time,
+        end_time=payload.end_time,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+    )
+    try:
+        result = await create_recurring_booking(
+            session,
+            facility_id=payload.facility_id,
+            customer_name=payload.customer_name,
+            customer_phone=payload.customer_phone,
+            recurrence=recurrence,
+            courts=payload.courts,
+            dry_run=payload.dry_run,
+        )
+    except ValueError as exc:
+        # SlotTakenError is a ValueError too; it only reaches here if the whole series was rejected.
+        raise HTTPException(status_code=409 if isinstance(exc, SlotTakenError) else 400, detail=str(exc))
+    if not payload.dry_run:
+        await session.commit()
+    return RecurringBookingResponse(
+        bookings=[
+            BookingResponse(
+                booking_id=b.id, start=b.start_time, end=b.end_time, court_id=b.court_id, price=b.price
+            )
+            for b in result.booked
+        ],
+        conflicts=[SlotOption(start=start, end=end) for start, end in result.conflicts],
+    )
 
 
 app.include_router(twilio_router, prefix="/twilio")
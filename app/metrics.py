@@ -0,0 +1,176 @@
+"""In-process latency histograms with Prometheus text exposition.
+
+Deliberately tiny: observations are a ``bisect`` and two additions on the
+event loop thread, with no locks and no client library. ``render()`` emits
+the text format served on ``/metrics``.
+
+Per-request I/O attribution uses a context variable: code running inside
+``track_io()`` gets database time (from cursor events, see ``app.db``) and
+calendar API time (from ``calendar_client``) added to its ``IoBreakdown``,
+including work done in child tasks spawned from it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import random
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, seconds: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, seconds)] += 1
+        series[1][0] += seconds
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(self.label_names, labels))
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            suffix = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{self.name}_sum{suffix} {total[0]}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STAGE_SECONDS = Histogram(
+    "receptionist_stage_seconds",
+    "Call pipeline stage latency: webhook routing, Realtime connect, prompt send, "
+    "audio first byte and per-turn response start.",
+    ("stage", "facility"),
+)
+TOOL_SECONDS = Histogram(
+    "receptionist_tool_seconds",
+    "Tool call latency, split into total, database and calendar API time.",
+    ("tool", "portion", "facility"),
+)
+_HISTOGRAMS = (STAGE_SECONDS, TOOL_SECONDS)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for histogram in _HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+class IoBreakdown:
+    __slots__ = ("db", "calendar")
+
+    def __init__(self) -> None:
+        self.db = 0.0
+        self.calendar = 0.0
+
+
+_current_io: ContextVar[Optional[IoBreakdown]] = ContextVar("current_io", default=None)
+
+
+@contextmanager
+def track_io(breakdown: Optional[IoBreakdown] = None) -> Iterator[IoBreakdown]:
+    if breakdown is None:
+        breakdown = IoBreakdown()
+    token = _current_io.set(breakdown)
+    try:
+        yield breakdown
+    finally:
+        _current_io.reset(token)
+
+
+def add_db_time(seconds: float) -> None:
+    breakdown = _current_io.get()
+    if breakdown is not None:
+        breakdown.db += seconds
+
+
+def add_calendar_time(seconds: float) -> None:
+    breakdown = _current_io.get()
+    if breakdown is not None:
+        breakdown.calendar += seconds
+
+
+class CallTiming:
+    """Stage timings for one call: feeds the histograms and, for slow calls, the log.
+
+    A call is slow when any stage or tool exceeds ``SLOW_CALL_THRESHOLD_MS``;
+    ``SLOW_CALL_SAMPLE_RATE`` of those get their full breakdown logged at
+    the end of the call. Leaving the threshold unset disables sampling.
+    """
+
+    def __init__(self, facility_id: str, call_id: Optional[str] = None):
+        self.facility = facility_id
+        self.call_id = call_id
+        self.started = time.perf_counter()
+        self.first_audio_at: Optional[float] = None
+        self.entries: List[Tuple[str, float]] = []
+        self._slowest = 0.0
+
+    def _note(self, name: str, seconds: float) -> None:
+        if settings.slow_call_threshold_ms is not None:
+            self.entries.append((name, seconds))
+            self._slowest = max(self._slowest, seconds)
+
+    def stage(self, stage: str, seconds: float) -> None:
+        STAGE_SECONDS.observe(seconds, stage, self.facility)
+        self._note(stage, seconds)
+
+    def tool(self, tool: str, seconds: float, io: IoBreakdown) -> None:
+        TOOL_SECONDS.observe(seconds, tool, "total", self.facility)
+        TOOL_SECONDS.observe(io.db, tool, "db", self.facility)
+        TOOL_SECONDS.observe(io.calendar, tool, "calendar", self.facility)
+        self._note(f"tool:{tool}", seconds)
+
+    def audio_sent(self) -> None:
+        """Mark AI audio reaching the caller; the first one is time-to-first-word."""
+        if self.first_audio_at is None:
+            self.first_audio_at = time.perf_counter()
+            self.stage("audio_first_byte", self.first_audio_at - self.started)
+
+    def finish(self) -> None:
+        threshold = settings.slow_call_threshold_ms
+        if threshold is None or self._slowest * 1000 < threshold:
+            return
+        if random.random() >= settings.slow_call_sample_rate:
+            return
+        logger.warning(
+            "Slow call %s: %s",
+            self.call_id,
+            json.dumps(
+                {
+                    "facility": self.facility,
+                    "duration_s": round(time.perf_counter() - self.started, 3),
+                    "timings_ms": [(name, round(seconds * 1000, 1)) for name, seconds in self.entries],
+                }
+            ),
+        )
@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, UUID
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, UUID, ExcludeConstraint
 from sqlalchemy.orm import relationship
 
 from app.db import Base
@@ -81,6 +81,20 @@ class Booking(Base):
     source = Column(String, nullable=False, default="phone_ai")
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow)
 
+    # A court can never hold two live bookings whose time ranges overlap.
+    # Requires the btree_gist extension for the UUID equality operator.
+    __table_args__ = (
+        ExcludeConstraint(
+            (court_id, "="),
+            (func.tstzrange(start_time, end_time), "&&"),
+            name="bookings_no_court_overlap",
+            using="gist",
+            where=text("status <> 'cancelled'"),
+        ),
+        # Caller context at ring time: a customer's bookings around now.
+        Index("ix_bookings_customer_start", "customer_id", "start_time"),
+    )
+
     customer = relationship("Customer", back_populates="bookings")
     court = relationship("Court", back_populates="bookings")
     facility = relationship("Facility")
@@ -101,3 +115,40 @@ class Call(Base):
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow)
 
     facility = relationship("Facility")
+    events = relationship("CallEvent", back_populates="call", order_by="CallEvent.seq")
+
+
+class CallEvent(Base):
+    """Append-only call timeline: transcript turns, tool calls and latencies."""
+
+    __tablename__ = "call_events"
+    __table_args__ = (Index("ix_call_events_call_seq", "call_id", "seq"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    call_id = Column(UUID(as_uuid=True), ForeignKey("calls.id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)
+    role = Column(String, nullable=True)
+    content = Column(Text, nullable=True)
+    data = Column(JSONB, nullable=True)
+    occurred_at = Column(TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow)
+
+    call = relationship("Call", back_populates="events")
+
+
+class CalendarOutbox(Base):
+    __tablename__ = "calendar_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
+    calendar_id = Column(String, nullable=False)
+    # Client-chosen Google event id; retries reuse it so the event is created at most once.
+    idempotency_key = Column(String, unique=True, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    processed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, default=datetime.utcnow)
+
+    booking = relationship("Booking")
@@ -1,5 +1,5 @@
-from datetime import datetime, date
-from typing import List
+from datetime import datetime, date, time
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 class SlotOption(BaseModel):
     start: datetime
     end: datetime
+    courts_available: Optional[int] = None
+    price: Optional[float] = None
 
 
 class AvailabilityRequest(BaseModel):
@@ -19,6 +21,18 @@ class AvailabilityResponse(BaseModel):
     slots: List[SlotOption]
 
 
+class AvailabilitySearchRequest(BaseModel):
+    facility_id: UUID
+    start_date: date
+    end_date: date
+    earliest: Optional[time] = None
+    latest: Optional[time] = None
+    weekdays: Optional[List[str]] = None
+    duration_minutes: Optional[int] = Field(None, gt=0)
+    courts: int = Field(1, ge=1)
+    limit: int = Field(5, ge=1, le=50)
+
+
 class BookingRequest(BaseModel):
     facility_id: UUID
     customer_name: str = Field(..., min_length=1)
@@ -31,6 +45,26 @@ class BookingResponse(BaseModel):
     booking_id: UUID
     start: datetime
     end: datetime
+    court_id: Optional[UUID] = None
+    price: Optional[float] = None
+
+
+class RecurringBookingRequest(BaseModel):
+    facility_id: UUID
+    customer_name: str = Field(..., min_length=1)
+    customer_phone: str = Field(..., min_length=5)
+    weekdays: List[str] = Field(..., min_items=1)
+    start_time: time
+    end_time: time
+    start_date: date
+    end_date: date
+    courts: int = Field(1, ge=1)
+    dry_run: bool = False
+
+
+class RecurringBookingResponse(BaseModel):
+    bookings: List[BookingResponse]
+    conflicts: List[SlotOption]
 
 
 class HealthResponse(BaseModel):
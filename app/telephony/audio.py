@@ -0,0 +1,117 @@
+"""Vectorised G.711 mu-law <-> PCM16 transcoding and 8 kHz <-> 24 kHz resampling.
+
+Twilio media streams carry 8 kHz mu-law; the Realtime API speaks 24 kHz
+little-endian PCM16. Both directions run on NumPy lookup tables over
+preallocated buffers, so a 20 ms frame costs a handful of array ops rather
+than a Python loop per sample.
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+
+TWILIO_SAMPLE_RATE = 8000
+REALTIME_SAMPLE_RATE = 24000
+RESAMPLE_FACTOR = REALTIME_SAMPLE_RATE // TWILIO_SAMPLE_RATE
+
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 32635
+_ULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+
+
+def _build_decode_table() -> np.ndarray:
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + _ULAW_BIAS) << exponent) - _ULAW_BIAS
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_encode_table() -> np.ndarray:
+    # Indexed by the int16 sample reinterpreted as uint16. Follows the
+    # reference g711.c segment search (as used by CPython's audioop).
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), _ULAW_CLIP >> 2) + (_ULAW_BIAS >> 2)
+    segment = np.searchsorted(_ULAW_SEGMENT_ENDS, magnitude, side="left")
+    codes = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    return np.where(segment >= 8, 0x7F ^ mask, codes ^ mask).astype(np.uint8)
+
+
+ULAW_TO_PCM16 = _build_decode_table()
+PCM16_TO_ULAW = _build_encode_table()
+_ULAW_TO_FLOAT = ULAW_TO_PCM16.astype(np.float32)
+
+
+def ulaw_to_pcm16(ulaw: bytes) -> np.ndarray:
+    return ULAW_TO_PCM16[np.frombuffer(ulaw, dtype=np.uint8)]
+
+
+def pcm16_to_ulaw(pcm: np.ndarray) -> bytes:
+    return PCM16_TO_ULAW[pcm.astype(np.int16, copy=False).view(np.uint16)].tobytes()
+
+
+class InboundTranscoder:
+    """Twilio mu-law 8 kHz -> Realtime PCM16 24 kHz for one call.
+
+    Upsamples by linear interpolation; the last sample of each frame is
+    carried into the next so frame boundaries stay continuous.
+    """
+
+    def __init__(self) -> None:
+        self._previous = 0.0
+        self._buffers: Dict[int, tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def _buffers_for(self, frame_samples: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        buffers = self._buffers.get(frame_samples)
+        if buffers is None:
+            buffers = (
+                np.empty(frame_samples + 1, dtype=np.float32),
+                np.empty(frame_samples, dtype=np.float32),
+                np.empty(frame_samples, dtype=np.float32),
+                np.empty(frame_samples * RESAMPLE_FACTOR, dtype=np.int16),
+            )
+            self._buffers[frame_samples] = buffers
+        return buffers
+
+    def process(self, ulaw: bytes) -> bytes:
+        if not ulaw:
+            return b""
+        codes = np.frombuffer(ulaw, dtype=np.uint8)
+        extended, step, scratch, out = self._buffers_for(len(codes))
+        extended[0] = self._previous
+        np.take(_ULAW_TO_FLOAT, codes, out=extended[1:])
+        np.subtract(extended[1:], extended[:-1], out=step)
+        for phase in range(RESAMPLE_FACTOR):
+            # Output sample 3i+k sits (k+1)/3 of the way from input i-1 to input i.
+            np.multiply(step, (phase + 1) / RESAMPLE_FACTOR, out=scratch)
+            np.add(extended[:-1], scratch, out=out[phase::RESAMPLE_FACTOR], casting="unsafe")
+        self._previous = float(extended[-1])
+        return out.tobytes()
+
+
+class OutboundTranscoder:
+    """Realtime PCM16 24 kHz -> Twilio mu-law 8 kHz for one call.
+
+    Decimates by averaging each group of three samples (a cheap low-pass
+    that keeps aliasing down). Deltas of any length are accepted; leftover
+    bytes and samples are carried into the next call.
+    """
+
+    def __init__(self) -> None:
+        self._carry = b""
+
+    def reset(self) -> None:
+        """Drop carried bytes, e.g. when queued AI audio is discarded on barge-in."""
+        self._carry = b""
+
+    def process(self, pcm: bytes) -> bytes:
+        data = self._carry + pcm if self._carry else pcm
+        usable = len(data) - len(data) % (2 * RESAMPLE_FACTOR)
+        self._carry = data[usable:]
+        if not usable:
+            return b""
+        samples = np.frombuffer(memoryview(data)[:usable], dtype="<i2").reshape(-1, RESAMPLE_FACTOR)
+        decimated = samples.mean(axis=1, dtype=np.float32)
+        return PCM16_TO_ULAW[np.rint(decimated).astype(np.int16).view(np.uint16)].tobytes()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import Integer, cast, func, update
+
+from app.config import get_settings
+from app.db import SessionLocal
+from app.models import Call, CallEvent
+from app.write_behind import WriteBehindQueue
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+call_log = WriteBehindQueue(
+    Call,
+    max_queue=settings.call_log_queue_size,
+    batch_size=settings.call_log_batch_size,
+    flush_interval=settings.call_log_flush_seconds,
+    put_timeout=settings.call_log_put_timeout_seconds,
+)
+
+# Events reference their Call row, which may still be queued above.
+call_events = WriteBehindQueue(
+    CallEvent,
+    max_queue=settings.call_log_queue_size,
+    batch_size=settings.call_log_batch_size,
+    flush_interval=settings.call_log_flush_seconds,
+    put_timeout=settings.call_log_put_timeout_seconds,
+    depends_on=call_log,
+)
+
+
+async def log_call_started(facility_id: UUID, caller_phone: Optional[str], meta: Dict[str, Any]) -> UUID:
+    """Queue the Call row for a new call and return its pre-generated id."""
+    call_id = uuid.uuid4()
+    await call_log.put(
+        {
+            "id": call_id,
+            "facility_id": facility_id,
+            "caller_phone": caller_phone,
+            "started_at": datetime.utcnow(),
+            "meta": meta,
+        }
+    )
+    return call_id
+
+
+class CallRecorder:
+    """Append one call's timeline to ``call_events`` as it happens.
+
+    Rows go through the write-behind queue, so a turn costs a queue put and
+    lands within ``CALL_LOG_FLUSH_SECONDS`` in a batch shared with other
+    calls; a crash loses at most that window rather than the whole call.
+    """
+
+    def __init__(self, call_id: UUID):
+        self.call_id = call_id
+        self.outcome: Optional[str] = None
+        self._seq = 0
+        self._finished = False
+
+    async def record(
+        self,
+        kind: str,
+        role: Optional[str] = None,
+        content: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._seq += 1
+        # Telemetry must never break the call: a failed write costs the event, nothing more.
+        try:
+            await call_events.put(
+                {
+                    "id": uuid.uuid4(),
+                    "call_id": self.call_id,
+                    "seq": self._seq,
+                    "kind": kind,
+                    "role": role,
+                    "content": content,
+                    "data": data,
+                    "occurred_at": datetime.utcnow(),
+                }
+            )
+        except Exception:
+            logger.exception("Failed to record %s event for call %s", kind, self.call_id)
+
+    async def transcript(self, role: str, text: str) -> None:
+        await self.record("transcript", role=role, content=text)
+
+    async def tool_call(self, name: str, arguments: Dict[str, Any], result: Any, elapsed_ms: float) -> None:
+        if name == "create_booking" and isinstance(result, dict) and result.get("booking_id"):
+            self.outcome = "booked"
+        await self.record(
+            "tool_call",
+            content=name,
+            data={"arguments": arguments, "result": result, "elapsed_ms": round(elapsed_ms, 1)},
+        )
+
+    async def latency(self, name: str, elapsed_ms: float) -> None:
+        await self.record("latency", content=name, data={"elapsed_ms": round(elapsed_ms, 1)})
+
+    async def finish(self, outcome: Optional[str] = None) -> None:
+        """Stamp ``ended_at``, ``duration_seconds`` and ``outcome`` on the Call row.
+
+        Queued events are left to the next regular flush rather than forcing
+        a flush of every call's events on each hang-up.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        stamp = (
+            update(Call)
+            .where(Call.id == self.call_id)
+            .values(
+                ended_at=func.now(),
+                duration_seconds=cast(func.extract("epoch", func.now() - Call.started_at), Integer),
+                outcome=outcome or self.outcome or "no_booking",
+            )
+        )
+        async with SessionLocal() as session:
+            result = await session.execute(stamp)
+            if result.rowcount == 0:
+                # The Call row is still queued (very short call or a backlog): write it first.
+                await call_log.flush()
+                await session.execute(stamp)
+            await session.commit()
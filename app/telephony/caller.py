@@ -0,0 +1,51 @@
+"""What is known about a caller, as plain data.
+
+Kept free of database imports so prompt building can use it without
+pulling in the engine; ``app.telephony.caller_context`` loads it.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, time as clock_time
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+import pytz
+
+# A weekday/time needs this many of the recent bookings to count as "usual".
+USUAL_MIN_COUNT = 2
+
+
+@dataclass(frozen=True)
+class BookingSummary:
+    start: datetime
+    end: datetime
+    court: Optional[str] = None
+
+
+@dataclass
+class CallerContext:
+    """What is known about the caller before they say anything."""
+
+    phone: str
+    customer_id: Optional[UUID] = None
+    name: Optional[str] = None
+    upcoming: List[BookingSummary] = field(default_factory=list)
+    recent: List[BookingSummary] = field(default_factory=list)
+
+    @property
+    def known(self) -> bool:
+        return self.customer_id is not None
+
+    def usual_slot(self, timezone: str) -> Optional[Tuple[int, clock_time, int]]:
+        """(weekday, local start time, count) of the caller's most frequent recent booking."""
+        tz = pytz.timezone(timezone)
+        counts = Counter()
+        for booking in self.recent:
+            local = booking.start.astimezone(tz)
+            counts[(local.weekday(), local.time())] += 1
+        if not counts:
+            return None
+        (weekday, start), count = counts.most_common(1)[0]
+        return (weekday, start, count) if count >= USUAL_MIN_COUNT else None
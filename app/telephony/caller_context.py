@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+import pytz
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db import SessionLocal
+from app.models import Booking, Court, Customer
+from app.telephony.caller import BookingSummary, CallerContext
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+UPCOMING_LIMIT = 3
+RECENT_LIMIT = 10
+
+
+async def load_caller_context(session: AsyncSession, facility_id: UUID, phone: str) -> CallerContext:
+    customer = (
+        await session.execute(select(Customer).where(Customer.facility_id == facility_id, Customer.phone == phone))
+    ).scalar_one_or_none()
+    if customer is None:
+        return CallerContext(phone=phone)
+
+    now = datetime.now(pytz.UTC)
+    base = (
+        select(Booking.start_time, Booking.end_time, Court.name)
+        .outerjoin(Court, Court.id == Booking.court_id)
+        .where(Booking.customer_id == customer.id, Booking.status != "cancelled")
+    )
+    upcoming = await session.execute(
+        base.where(Booking.start_time >= now).order_by(Booking.start_time).limit(UPCOMING_LIMIT)
+    )
+    recent = await session.execute(
+        base.where(Booking.start_time < now).order_by(Booking.start_time.desc()).limit(RECENT_LIMIT)
+    )
+    return CallerContext(
+        phone=phone,
+        customer_id=customer.id,
+        name=customer.name,
+        upcoming=[BookingSummary(start, end, court) for start, end, court in upcoming],
+        recent=[BookingSummary(start, end, court) for start, end, court in recent],
+    )
+
+
+async def _load(facility_id: UUID, phone: str) -> CallerContext:
+    async with SessionLocal() as session:
+        return await load_caller_context(session, facility_id, phone)
+
+
+class CallerPrefetcher:
+    """Caller lookups started at ring time and collected when the media stream starts.
+
+    The voice webhook calls ``start`` as soon as it knows the ``From``
+    number, so the customer and booking queries overlap Twilio connecting
+    the stream and the Realtime session being acquired. ``claim`` waits at
+    most ``wait_seconds`` for the result; a slow or failed lookup just
+    means the call starts without caller context. Lookups that are never
+    claimed (caller hung up during the greeting) are dropped after
+    ``ttl_seconds``. A stream served by a different worker than its webhook
+    finds nothing here and runs the lookup itself.
+    """
+
+    def __init__(
+        self,
+        wait_seconds: float,
+        ttl_seconds: float,
+        loader: Callable[[UUID, str], Awaitable[CallerContext]] = _load,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.wait_seconds = wait_seconds
+        self.ttl_seconds = ttl_seconds
+        self._loader = loader
+        self._clock = clock
+        # call id -> (started at, lookup task); insertion order is start order.
+        self._pending: Dict[str, Tuple[float, asyncio.Task]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.timeouts = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _expire(self) -> None:
+        cutoff = self._clock() - self.ttl_seconds
+        while self._pending:
+            call_id, (started, task) = next(iter(self._pending.items()))
+            if started > cutoff:
+                break
+            del self._pending[call_id]
+            task.cancel()
+
+    def start(self, call_id: str, facility_id: UUID, phone: Optional[str]) -> None:
+        self._expire()
+        if not phone:
+            return
+        task = asyncio.create_task(self._loader(facility_id, phone))
+        task.add_done_callback(_consume_exception)
+        self._pending[str(call_id)] = (self._clock(), task)
+
+    async def claim(self, call_id: Optional[str], facility_id: UUID, phone: Optional[str]) -> Optional[CallerContext]:
+        entry = self._pending.pop(str(call_id), None) if call_id else None
+        if entry is not None:
+            self.hits += 1
+            task = entry[1]
+        elif phone:
+            self.misses += 1
+            task = asyncio.create_task(self._loader(facility_id, phone))
+        else:
+            return None
+        try:
+            return await asyncio.wait_for(task, self.wait_seconds)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning("Caller lookup for call %s took over %.2fs; starting without it", call_id, self.wait_seconds)
+        except Exception:
+            logger.exception("Caller lookup failed for call %s", call_id)
+        return None
+
+    async def stop(self) -> None:
+        tasks = [task for _, task in self._pending.values()]
+        self._pending.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # Unclaimed lookups that failed would otherwise log "exception never retrieved".
+    if not task.cancelled():
+        task.exception()
+
+
+caller_prefetcher = CallerPrefetcher(
+    wait_seconds=settings.caller_prefetch_wait_seconds,
+    ttl_seconds=settings.caller_prefetch_ttl_seconds,
+)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+FRAME_MS = 20
+FRAME_BYTES = 160  # 20 ms of 8 kHz mu-law
+ULAW_SILENCE = b"\xff"
+
+FrameSender = Callable[[bytes], Awaitable[None]]
+ClearSender = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class PlayoutStats:
+    frames_sent: int = 0
+    underruns: int = 0
+    clears: int = 0
+    frames_cleared: int = 0
+    max_depth_frames: int = 0
+
+
+class PlayoutBuffer:
+    """Paced outbound audio for one call.
+
+    AI audio arrives in bursts much faster than real time. It is cut into
+    20 ms mu-law frames and released on a monotonic clock, staying at most
+    ``lead_ms`` ahead of the caller's playback, so Twilio never holds more
+    than that and a barge-in only has a few frames in flight to discard.
+
+    An underrun is counted when the queue runs dry while a response is
+    still streaming (between the first ``push`` and ``finish``).
+    """
+
+    def __init__(
+        self,
+        send_frame: FrameSender,
+        send_clear: ClearSender,
+        lead_ms: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._send_frame = send_frame
+        self._send_clear = send_clear
+        self._frame_seconds = FRAME_MS / 1000
+        self._lead = lead_ms / 1000
+        self._clock = clock
+        self._frames: Deque[bytes] = deque()
+        self._partial = bytearray()
+        self._next_due: Optional[float] = None
+        self._streaming = False
+        self._starved = False
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = PlayoutStats()
+
+    @property
+    def depth_frames(self) -> int:
+        return len(self._frames)
+
+    @property
+    def depth_ms(self) -> int:
+        return len(self._frames) * FRAME_MS + len(self._partial) * FRAME_MS // FRAME_BYTES
+
+    def push(self, ulaw: bytes) -> None:
+        """Queue mu-law audio; whole frames become eligible for playout."""
+        if not ulaw:
+            return
+        self._streaming = True
+        self._partial += ulaw
+        whole = len(self._partial) - len(self._partial) % FRAME_BYTES
+        for offset in range(0, whole, FRAME_BYTES):
+            self._frames.append(bytes(self._partial[offset : offset + FRAME_BYTES]))
+        del self._partial[:whole]
+        if len(self._frames) > self.stats.max_depth_frames:
+            self.stats.max_depth_frames = len(self._frames)
+        self._starved = False
+        self._ready.set()
+
+    def finish(self) -> None:
+        """Mark the end of a response; pad and release any trailing partial frame."""
+        if self._partial:
+            padding = ULAW_SILENCE * (FRAME_BYTES - len(self._partial))
+            self._frames.append(bytes(self._partial) + padding)
+            self._partial.clear()
+            self._ready.set()
+        self._streaming = False
+
+    async def clear(self) -> None:
+        """Barge-in: drop everything queued and tell Twilio to flush its buffer."""
+        self.stats.clears += 1
+        self.stats.frames_cleared += len(self._frames)
+        self._frames.clear()
+        self._partial.clear()
+        self._streaming = False
+        self._next_due = None
+        await self._send_clear()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._frames:
+                if self._streaming and not self._starved:
+                    self.stats.underruns += 1
+                    self._starved = True
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            now = self._clock()
+            if self._next_due is None or self._next_due < now - self._lead:
+                # New talk spurt, or we fell behind after an underrun: restart the clock.
+                self._next_due = now
+            wait = self._next_due - self._lead - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            frame = self._frames.popleft()
+            self._next_due += self._frame_seconds
+            await self._send_frame(frame)
+            self.stats.frames_sent += 1
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.exception("Playout task failed")
+            self._task = None
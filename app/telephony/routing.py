@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import SessionLocal
+from app.models import Facility
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FacilityRoute:
+    facility_id: UUID
+    enabled: bool
+
+
+class RoutingTable:
+    """In-memory dialed number -> facility index used on the ring path.
+
+    The table is loaded at startup and refreshed periodically in the
+    background; ``update``/``remove`` apply edits immediately.
+    """
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, FacilityRoute] = {}
+        self.loaded_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    async def load(self, session: AsyncSession) -> None:
+        result = await session.execute(select(Facility.phone_number, Facility.id, Facility.enabled))
+        # Build a fresh dict and swap it in so readers never see a partial table.
+        self._routes = {
+            phone: FacilityRoute(facility_id=facility_id, enabled=enabled)
+            for phone, facility_id, enabled in result.all()
+        }
+        self.loaded_at = time.monotonic()
+
+    def lookup(self, phone_number: str) -> Optional[FacilityRoute]:
+        return self._routes.get(phone_number)
+
+    async def resolve(self, session: AsyncSession, phone_number: str) -> Optional[FacilityRoute]:
+        """Look up a number, falling back to the DB for numbers added since the last refresh."""
+        route = self._routes.get(phone_number)
+        if route is not None:
+            return route
+        result = await session.execute(
+            select(Facility.id, Facility.enabled).where(Facility.phone_number == phone_number)
+        )
+        row = result.first()
+        if not row:
+            return None
+        route = FacilityRoute(facility_id=row.id, enabled=row.enabled)
+        self._routes[phone_number] = route
+        return route
+
+    def update(self, facility: Facility) -> None:
+        for phone, route in list(self._routes.items()):
+            if route.facility_id == facility.id and phone != facility.phone_number:
+                del self._routes[phone]
+        self._routes[facility.phone_number] = FacilityRoute(facility_id=facility.id, enabled=facility.enabled)
+
+    def remove(self, phone_number: str) -> None:
+        self._routes.pop(phone_number, None)
+
+    async def refresh(self) -> None:
+        async with SessionLocal() as session:
+            await self.load(session)
+
+    async def _refresh_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh facility routing table")
+
+    async def start(self, interval_seconds: float) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            # Keep serving; resolve() falls back to the DB until a refresh succeeds.
+            logger.exception("Failed to load facility routing table")
+        self._task = asyncio.create_task(self._refresh_loop(interval_seconds))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+routing_table = RoutingTable()
@@ -1,9 +1,28 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import base64
+import logging
+from typing import Optional
+from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.ai.realtime_client import RealtimeClient
+from app.metrics import CallTiming
+from app.booking_service import FacilityWithConfig, get_facility_with_config
+from app.config import get_settings
+from app.db import SessionLocal
+from app.telephony.audio import InboundTranscoder, OutboundTranscoder
+from app.telephony.call_log import CallRecorder
+from app.telephony.caller_context import caller_prefetcher
+from app.telephony.playout import PlayoutBuffer
+from app.telephony.vad import SilenceSuppressor
+from app.utils import codec
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
 router = APIRouter()
 
 
@@ -15,20 +34,152 @@ def get_stream_url(call_id: str) -> str:
     return STREAM_PATH + f"?call_id={call_id}"
 
 
+class CallAudioBridge:
+    """Shuttle audio between one Twilio media stream and its Realtime session.
+
+    Caller audio arrives as base64 mu-law 8 kHz and is forwarded as PCM16
+    24 kHz, with silent stretches held back by a local VAD; AI audio deltas go back the other way through a paced playout
+    buffer, which is flushed as soon as the caller starts talking over it.
+    """
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        stream_sid: str,
+        facility_data: FacilityWithConfig,
+        call_id: Optional[UUID] = None,
+        caller_phone: Optional[str] = None,
+    ):
+        self.ws = ws
+        self.stream_sid = stream_sid
+        self.facility_id = facility_data.facility.id
+        self.call_id = call_id
+        self.caller_phone = caller_phone
+        self.recorder = CallRecorder(call_id) if call_id else None
+        self.timing = CallTiming(str(facility_data.facility.id), str(call_id) if call_id else None)
+        self.inbound = InboundTranscoder()
+        self.outbound = OutboundTranscoder()
+        self.vad = (
+            SilenceSuppressor(
+                margin_db=settings.vad_margin_db,
+                hangover_ms=settings.vad_hangover_ms,
+                preroll_ms=settings.vad_preroll_ms,
+            )
+            if settings.vad_enabled
+            else None
+        )
+        self.playout = PlayoutBuffer(self._send_frame, self._send_clear, lead_ms=settings.playout_lead_ms)
+        self.realtime = RealtimeClient(
+            facility_data.facility,
+            facility_data.config,
+            on_audio=self.send_ai_audio,
+            on_speech_started=self.barge_in,
+            on_audio_done=self.ai_audio_done,
+            courts=facility_data.courts,
+            recorder=self.recorder,
+            timing=self.timing,
+        )
+        self._listen_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self.playout.start()
+        # The caller lookup began at ring time; collect it while the Realtime session is acquired.
+        caller_lookup = caller_prefetcher.claim(
+            str(self.call_id) if self.call_id else None, self.facility_id, self.caller_phone
+        )
+        await self.realtime.connect(caller_lookup)
+        self._listen_task = asyncio.create_task(self.realtime.listen())
+
+    async def forward_caller_audio(self, payload: str) -> None:
+        ulaw = base64.b64decode(payload)
+        frames = self.vad.process(ulaw) if self.vad else [ulaw]
+        for frame in frames:
+            await self.realtime.send_audio(self.inbound.process(frame))
+
+    async def send_ai_audio(self, pcm: bytes) -> None:
+        self.playout.push(self.outbound.process(pcm))
+
+    async def ai_audio_done(self) -> None:
+        self.playout.finish()
+
+    async def barge_in(self) -> None:
+        self.outbound.reset()
+        await self.playout.clear()
+
+    async def _send_frame(self, ulaw: bytes) -> None:
+        self.timing.audio_sent()
+        await self.ws.send_text(codec.twilio_media_message(self.stream_sid, base64.b64encode(ulaw).decode("ascii")))
+
+    async def _send_clear(self) -> None:
+        await self.ws.send_text(codec.twilio_clear_message(self.stream_sid))
+
+    async def close(self) -> None:
+        await self.playout.stop()
+        stats = self.playout.stats
+        logger.info(
+            "Stream %s playout: %d frames sent, %d underruns, %d clears (%d frames dropped), max depth %d frames",
+            self.stream_sid,
+            stats.frames_sent,
+            stats.underruns,
+            stats.clears,
+            stats.frames_cleared,
+            stats.max_depth_frames,
+        )
+        if self.vad:
+            logger.info(
+                "Stream %s VAD: %d/%d caller frames suppressed (%.0f%%)",
+                self.stream_sid,
+                self.vad.stats.suppressed,
+                self.vad.stats.frames,
+                self.vad.stats.suppressed_fraction * 100,
+            )
+        if self._listen_task:
+            self._listen_task.cancel()
+            try:
+                await self._listen_task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.exception("Realtime listener failed for stream %s", self.stream_sid)
+        await self.realtime.close()
+        self.timing.finish()
+        if self.recorder:
+            try:
+                await self.recorder.finish()
+            except Exception:
+                logger.exception("Failed to finalise call %s", self.recorder.call_id)
+
+
 @router.websocket("/media")
 async def media_stream(ws: WebSocket):
     await ws.accept()
     call_id = ws.query_params.get("call_id")
+    bridge: Optional[CallAudioBridge] = None
     try:
         while True:
-            message = await ws.receive_text()
-            payload = json.loads(message)
-            # TODO: Handle Twilio audio chunks and forward to OpenAI Realtime session.
-            # Expected format includes media.payload (base64-encoded audio) and other metadata.
-            # 1. Decode/convert audio payload to format expected by OpenAI Realtime audio stream.
-            # 2. Send audio frames over the Realtime WebSocket client.
-            # 3. Receive AI-generated audio and push back to Twilio via <Stream> websocket (ws.send_bytes).
-            # 4. Manage session lifecycle and teardown when call ends.
+            event, payload, message = codec.parse_twilio_event(await ws.receive_text())
+            if event == "media":
+                if bridge and payload:
+                    await bridge.forward_caller_audio(payload)
+            elif event == "start":
+                start = message["start"]
+                params = start.get("customParameters") or {}
+                call_id = params.get("call_id") or call_id
+                facility_id = params.get("facility_id") or ws.query_params.get("facility_id")
+                async with SessionLocal() as session:
+                    facility_data = await get_facility_with_config(session, facility_id)
+                bridge = CallAudioBridge(
+                    ws,
+                    start["streamSid"],
+                    facility_data,
+                    call_id=UUID(call_id) if call_id else None,
+                    caller_phone=params.get("caller_phone"),
+                )
+                await bridge.start()
+            elif event == "stop":
+                break
     except WebSocketDisconnect:
-        # TODO: Cleanup Realtime session and any resources.
         pass
+    finally:
+        if bridge:
+            await bridge.close()
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import time
+
 from fastapi import APIRouter, Depends, Form, HTTPException
 from fastapi.responses import Response
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from twilio.twiml.voice_response import VoiceResponse
 
+from app import metrics
 from app.db import get_session
-from app.models import Call, Facility
 from app.telephony import twilio_media
+from app.telephony.call_log import log_call_started
+from app.telephony.caller_context import caller_prefetcher
+from app.telephony.routing import routing_table
 
 router = APIRouter()
 
@@ -20,17 +24,26 @@ async def voice_webhook(
     CallSid: str = Form(...),
     session: AsyncSession = Depends(get_session),
 ):
-    facility_result = await session.execute(select(Facility).where(Facility.phone_number == To))
-    facility = facility_result.scalar_one_or_none()
-    if not facility:
+    started = time.perf_counter()
+    route = await routing_table.resolve(session, To)
+    if not route:
         raise HTTPException(status_code=404, detail="Facility not found for this number")
+    if not route.enabled:
+        response = VoiceResponse()
+        response.reject()
+        return Response(content=str(response), media_type="application/xml")
 
-    call = Call(facility_id=facility.id, caller_phone=From, meta={"CallSid": CallSid})
-    session.add(call)
-    await session.commit()
+    call_id = await log_call_started(route.facility_id, caller_phone=From, meta={"CallSid": CallSid})
+    # Look the caller up while Twilio plays the hold message and opens the stream.
+    caller_prefetcher.start(str(call_id), route.facility_id, From)
 
     response = VoiceResponse()
     response.say("Connecting you to our AI receptionist. Please hold.")
-    stream_url = twilio_media.get_stream_url(call_id=str(call.id))
-    response.connect().stream(url=stream_url)
+    stream_url = twilio_media.get_stream_url(call_id=str(call_id))
+    stream = response.connect().stream(url=stream_url)
+    # Twilio hands <Parameter> values to the media websocket in its "start" message.
+    stream.parameter(name="call_id", value=str(call_id))
+    stream.parameter(name="facility_id", value=str(route.facility_id))
+    stream.parameter(name="caller_phone", value=From)
+    metrics.STAGE_SECONDS.observe(time.perf_counter() - started, "webhook_routing", str(route.facility_id))
     return Response(content=str(response), media_type="application/xml")
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List
+
+import numpy as np
+
+from app.telephony.audio import ULAW_TO_PCM16
+
+FRAME_MS = 20
+_FULL_SCALE_POWER = 32768.0**2
+# Per-code squared amplitude and sign, so a frame's energy and zero crossings
+# are a couple of table lookups instead of float conversions.
+_ULAW_POWER = ULAW_TO_PCM16.astype(np.float64) ** 2
+_ULAW_NEGATIVE = ULAW_TO_PCM16 < 0
+
+
+@dataclass
+class VadStats:
+    frames: int = 0
+    forwarded: int = 0
+    suppressed: int = 0
+
+    @property
+    def suppressed_fraction(self) -> float:
+        return self.suppressed / self.frames if self.frames else 0.0
+
+
+class SilenceSuppressor:
+    """Energy / zero-crossing voice activity gate for caller audio (8 kHz mu-law).
+
+    A frame counts as speech when its energy clears an adaptive noise floor
+    by ``margin_db``, or clears it by half that with a high zero-crossing
+    rate (unvoiced onsets such as "s" or "f"). The floor is a low percentile
+    of the energy of every frame over the last ``floor_window_ms``: the gaps
+    between words keep it at the background level while someone talks, and
+    steady noise of any level becomes the floor within one window instead of
+    passing as speech for good. Silent frames are held back:
+
+    * the last ``preroll_ms`` of silence is kept and released ahead of the
+      first speech frame, so word onsets reach the server intact;
+    * after speech, frames keep flowing for ``hangover_ms``. This must be
+      longer than the Realtime server VAD's silence window, otherwise the
+      server never sees the end of the turn.
+    """
+
+    def __init__(
+        self,
+        margin_db: float = 12.0,
+        min_speech_db: float = -55.0,
+        hangover_ms: float = 800.0,
+        preroll_ms: float = 200.0,
+        zcr_threshold: float = 0.3,
+        floor_window_ms: float = 2000.0,
+        floor_percentile: float = 10.0,
+        floor_update_ms: float = 200.0,
+    ):
+        self.margin_db = margin_db
+        self.min_speech_db = min_speech_db
+        self.zcr_threshold = zcr_threshold
+        self.floor_percentile = floor_percentile
+        self._hangover_frames = int(hangover_ms // FRAME_MS)
+        self._preroll: Deque[bytes] = deque(maxlen=max(0, int(preroll_ms // FRAME_MS)))
+        # Recent frame energies; the percentile is recomputed every few frames, not per frame.
+        self._energies: Deque[float] = deque(maxlen=max(1, int(floor_window_ms // FRAME_MS)))
+        self._floor_update_frames = max(1, int(floor_update_ms // FRAME_MS))
+        self._since_floor_update = 0
+        self._noise_floor_db = -60.0
+        self._hangover = 0
+        self.stats = VadStats()
+
+    def _is_speech(self, ulaw: bytes) -> bool:
+        codes = np.frombuffer(ulaw, dtype=np.uint8)
+        power = _ULAW_POWER[codes].mean()
+        energy_db = 10.0 * np.log10(power / _FULL_SCALE_POWER + 1e-12)
+        negative = _ULAW_NEGATIVE[codes]
+        zcr = np.count_nonzero(negative[1:] != negative[:-1]) / max(1, len(codes) - 1)
+
+        self._energies.append(energy_db)
+        self._since_floor_update += 1
+        if self._since_floor_update >= self._floor_update_frames:
+            self._noise_floor_db = float(np.percentile(self._energies, self.floor_percentile))
+            self._since_floor_update = 0
+        above_floor = energy_db - self._noise_floor_db
+        speech = energy_db >= self.min_speech_db and (
+            above_floor >= self.margin_db or (above_floor >= self.margin_db / 2 and zcr >= self.zcr_threshold)
+        )
+        return bool(speech)
+
+    def process(self, ulaw: bytes) -> List[bytes]:
+        """Return the frames to forward for this input frame (possibly none)."""
+        self.stats.frames += 1
+        if self._is_speech(ulaw):
+            self._hangover = self._hangover_frames
+            frames = list(self._preroll)
+            self._preroll.clear()
+            frames.append(ulaw)
+        elif self._hangover > 0:
+            self._hangover -= 1
+            frames = [ulaw]
+        else:
+            self._preroll.append(ulaw)
+            self.stats.suppressed += 1
+            return []
+        # Pre-roll frames were counted as suppressed when they arrived; they are forwarded after all.
+        released = len(frames) - 1
+        self.stats.suppressed -= released
+        self.stats.forwarded += len(frames)
+        return frames
@@ -0,0 +1,114 @@
+"""JSON codec for the websocket hot paths.
+
+Uses orjson when it is installed and the stdlib ``json`` module otherwise;
+both produce compact output and handle datetimes, UUIDs and Decimals.
+
+Twilio media frames (50 per second per call) and Realtime audio deltas are
+the bulk of the traffic and only a couple of their fields are ever read, so
+they get dedicated helpers that slice the base64 payload out of the raw text
+instead of building a dict, and fall back to a full parse for anything else.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple, Union
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+
+    def loads(data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=_default).decode("utf-8")
+
+else:
+
+    def loads(data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), default=_default)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return dumps(obj).encode("utf-8")
+
+
+def _string_field(text: str, key: str, start: int = 0) -> Optional[str]:
+    """Slice ``"key":"value"`` out of raw JSON, or None if absent or escaped."""
+    marker = f'"{key}":"'
+    idx = text.find(marker, start)
+    if idx < 0:
+        return None
+    idx += len(marker)
+    end = text.find('"', idx)
+    if end < 0:
+        return None
+    value = text[idx:end]
+    # Base64 never needs escaping; a backslash means the fast path cannot trust the slice.
+    return None if "\\" in value else value
+
+
+# (event, base64 payload for media events, full message for everything else)
+TwilioEvent = Tuple[Optional[str], Optional[str], Optional[Dict[str, Any]]]
+
+_MEDIA_MARKER = '"event":"media"'
+_PAYLOAD_MARKER = '"payload":"'
+
+
+def parse_twilio_event(text: str) -> TwilioEvent:
+    # Inlined rather than built on _string_field: this runs 50 times a second per call.
+    if _MEDIA_MARKER in text:
+        idx = text.find(_PAYLOAD_MARKER)
+        if idx >= 0:
+            idx += len(_PAYLOAD_MARKER)
+            payload = text[idx : text.find('"', idx)]
+            if "\\" not in payload:
+                return "media", payload, None
+    message = loads(text)
+    media = message.get("media") or {}
+    return message.get("event"), media.get("payload"), message
+
+
+def twilio_media_message(stream_sid: str, payload: str) -> str:
+    # Stream SIDs and base64 need no escaping.
+    return f'{{"event":"media","streamSid":"{stream_sid}","media":{{"payload":"{payload}"}}}}'
+
+
+def twilio_clear_message(stream_sid: str) -> str:
+    return f'{{"event":"clear","streamSid":"{stream_sid}"}}'
+
+
+_AUDIO_DELTA_PREFIX = '{"type":"response.audio.delta"'
+
+
+def peek_audio_delta(text: Union[str, bytes]) -> Optional[str]:
+    """Return the base64 ``delta`` of a ``response.audio.delta`` event, else None."""
+    if isinstance(text, str) and text.startswith(_AUDIO_DELTA_PREFIX):
+        return _string_field(text, "delta", len(_AUDIO_DELTA_PREFIX))
+    return None
+
+
+def audio_append_message(audio: str) -> str:
+    return f'{{"type":"input_audio_buffer.append","audio":"{audio}"}}'
@@ -4,6 +4,9 @@ from datetime import datetime, time, timedelta
 import pytz
 from typing import Iterable, Tuple
 
+# The keys FacilityConfig.open_hours uses, indexed by datetime.weekday().
+WEEKDAY_KEYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
 
 def parse_time_range(range_str: str) -> Tuple[time, time]:
     start_str, end_str = range_str.split("-")
@@ -13,8 +16,13 @@ def parse_time_range(range_str: str) -> Tuple[time, time]:
 
 
 def generate_slots_for_day(
-    date_value: datetime, ranges: Iterable[str], slot_minutes: int, tz_name: str
+    date_value: datetime,
+    ranges: Iterable[str],
+    slot_minutes: int,
+    tz_name: str,
+    step_minutes: int | None = None,
 ) -> list[tuple[datetime, datetime]]:
+    """Slots of ``slot_minutes`` inside the open ranges, starting every ``step_minutes`` (default: back to back)."""
     tz = pytz.timezone(tz_name)
     slots: list[tuple[datetime, datetime]] = []
     for range_str in ranges:
@@ -24,9 +32,10 @@ def generate_slots_for_day(
 
         current = window_start
         delta = timedelta(minutes=slot_minutes)
+        step = timedelta(minutes=step_minutes or slot_minutes)
         while current + delta <= window_end:
             slots.append((current, current + delta))
-            current += delta
+            current += step
     return slots
 
 
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+# Ceiling for the retry delay while the database keeps rejecting flushes.
+MAX_RETRY_SECONDS = 30.0
+
+
+class WriteBehindQueue:
+    """Buffer inserts for one table and write them in batches from a background task.
+
+    ``put`` returns as soon as the row is queued. When the bounded queue is
+    full for longer than ``put_timeout`` the caller pays for a direct insert
+    instead, which slows producers down rather than dropping rows.
+    ``depends_on`` queues are flushed first, so rows with foreign keys into
+    another write-behind table never land before their parents.
+
+    At most one batch is held outside the queue: while flushes fail the
+    worker stops draining the queue and backs off, so the queue bound and
+    ``put_timeout`` keep applying. A batch rejected with an IntegrityError
+    is bisected until the offending rows are isolated; those are logged and
+    dropped so one bad row cannot block everything queued behind it.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        put_timeout: float,
+        depends_on: Optional["WriteBehindQueue"] = None,
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.depends_on = depends_on
+        self.rows_written = 0
+        self.batches_written = 0
+        self.direct_writes = 0
+        self.rows_dropped = 0
+        self._queue: asyncio.Queue[Row] = asyncio.Queue(maxsize=max_queue)
+        self._pending: List[Row] = []
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() + len(self._pending)
+
+    async def put(self, row: Row) -> None:
+        if self._task is None:
+            # Not started (e.g. scripts, one-off tools): write through.
+            await self._write_direct(row)
+            return
+        try:
+            await asyncio.wait_for(self._queue.put(row), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            self.direct_writes += 1
+            await self._write_direct(row)
+
+    async def _write_direct(self, row: Row) -> None:
+        # The row may reference a parent that is still queued upstream.
+        if self.depends_on is not None:
+            await self.depends_on.flush()
+        await self._write([row])
+
+    async def flush(self) -> None:
+        if self.depends_on is not None:
+            await self.depends_on.flush()
+        async with self._lock:
+            while True:
+                while len(self._pending) < self.batch_size and not self._queue.empty():
+                    self._pending.append(self._queue.get_nowait())
+                if not self._pending:
+                    return
+                await self._write(list(self._pending))
+
+    async def _write(self, rows: List[Row]) -> None:
+        """Insert ``rows``, dropping any that violate a constraint; other errors propagate."""
+        try:
+            await self._insert(rows)
+        except IntegrityError as exc:
+            if len(rows) > 1:
+                middle = len(rows) // 2
+                await self._write(rows[:middle])
+                await self._write(rows[middle:])
+                return
+            self.rows_dropped += 1
+            logger.error("Dropping %s row %r: %s", self.model.__tablename__, rows[0], exc.orig)
+        self._forget(rows)
+
+    def _forget(self, rows: List[Row]) -> None:
+        # Written (or dropped) rows leave _pending right away, so a retry after a
+        # failure part-way through a bisection never inserts them twice.
+        done = {id(row) for row in rows}
+        self._pending = [row for row in self._pending if id(row) not in done]
+
+    async def _insert(self, rows: List[Row]) -> None:
+        async with SessionLocal() as session:
+            await session.execute(insert(self.model), rows)
+            await session.commit()
+        self.rows_written += len(rows)
+        self.batches_written += 1
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        failures = 0
+        while True:
+            # After a failed flush the held batch is retried before anything new is taken.
+            if not self._pending:
+                self._pending.append(await self._queue.get())
+                deadline = loop.time() + self.flush_interval
+                while len(self._pending) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        self._pending.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+            try:
+                await self.flush()
+                failures = 0
+            except Exception:
+                failures += 1
+                logger.exception("Failed to flush %s rows", self.model.__tablename__)
+                await asyncio.sleep(min(self.flush_interval * 2**failures, MAX_RETRY_SECONDS))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
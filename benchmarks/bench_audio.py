@@ -0,0 +1,119 @@
+"""CPU cost of the Twilio <-> Realtime audio path per concurrent call.
+
+Each simulated call pushes one second of audio each way through the same
+steps the bridge runs per 20 ms frame: base64 decode, mu-law -> PCM16
+8 kHz -> 24 kHz, base64 encode (inbound) and base64 decode, 24 kHz ->
+8 kHz, PCM16 -> mu-law, base64 encode (outbound). The result is CPU
+milliseconds per second of call audio, which bounds calls per core.
+
+    python -m benchmarks.bench_audio --calls 200 --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import time
+
+import numpy as np
+
+from app.telephony.audio import (
+    PCM16_TO_ULAW,
+    ULAW_TO_PCM16,
+    InboundTranscoder,
+    OutboundTranscoder,
+    pcm16_to_ulaw,
+)
+
+FRAME_MS = 20
+FRAMES_PER_SECOND = 1000 // FRAME_MS
+ULAW_FRAME_BYTES = 160
+PCM24_FRAME_BYTES = 960
+
+
+class PurePythonBridge:
+    """Per-sample reference path, for comparison only."""
+
+    def __init__(self) -> None:
+        self.decode = ULAW_TO_PCM16.tolist()
+        self.encode = PCM16_TO_ULAW.tolist()
+        self.previous = 0
+
+    def inbound(self, ulaw: bytes) -> bytes:
+        out = []
+        previous = self.previous
+        for code in ulaw:
+            sample = self.decode[code]
+            for phase in (1, 2, 3):
+                out.append(int(previous + (sample - previous) * phase / 3))
+            previous = sample
+        self.previous = previous
+        return np.array(out, dtype=np.int16).tobytes()
+
+    def outbound(self, pcm: bytes) -> bytes:
+        samples = np.frombuffer(pcm, dtype="<i2").tolist()
+        return bytes(
+            self.encode[round(sum(samples[i : i + 3]) / 3) & 0xFFFF] for i in range(0, len(samples) - 2, 3)
+        )
+
+
+def make_frames(seconds: int) -> tuple[list[str], list[str]]:
+    rng = np.random.default_rng(3)
+    frames = seconds * FRAMES_PER_SECOND
+    t = np.arange(frames * ULAW_FRAME_BYTES) / 8000
+    speech = (6000 * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 300, t.size)).astype(np.int16)
+    ulaw = pcm16_to_ulaw(speech)
+    inbound = [
+        base64.b64encode(ulaw[i * ULAW_FRAME_BYTES : (i + 1) * ULAW_FRAME_BYTES]).decode() for i in range(frames)
+    ]
+    ai_pcm = rng.integers(-8000, 8000, frames * PCM24_FRAME_BYTES // 2, dtype=np.int16).tobytes()
+    outbound = [
+        base64.b64encode(ai_pcm[i * PCM24_FRAME_BYTES : (i + 1) * PCM24_FRAME_BYTES]).decode() for i in range(frames)
+    ]
+    return inbound, outbound
+
+
+def run_vectorised(calls: int, inbound: list[str], outbound: list[str]) -> float:
+    bridges = [(InboundTranscoder(), OutboundTranscoder()) for _ in range(calls)]
+    started = time.process_time()
+    # Interleave calls frame by frame, as the event loop would.
+    for frame_in, frame_out in zip(inbound, outbound):
+        for inbound_tc, outbound_tc in bridges:
+            base64.b64encode(inbound_tc.process(base64.b64decode(frame_in)))
+            base64.b64encode(outbound_tc.process(base64.b64decode(frame_out)))
+    return time.process_time() - started
+
+
+def run_pure_python(calls: int, inbound: list[str], outbound: list[str]) -> float:
+    bridges = [PurePythonBridge() for _ in range(calls)]
+    started = time.process_time()
+    for frame_in, frame_out in zip(inbound, outbound):
+        for bridge in bridges:
+            base64.b64encode(bridge.inbound(base64.b64decode(frame_in)))
+            base64.b64encode(bridge.outbound(base64.b64decode(frame_out)))
+    return time.process_time() - started
+
+
+def report(name: str, cpu_seconds: float, calls: int, seconds: int) -> None:
+    per_call_second = cpu_seconds / (calls * seconds) * 1000
+    print(
+        f"{name:>12}: {per_call_second:7.3f} ms CPU per call-second "
+        f"({per_call_second / 10:.2f}% of a core per call, ~{1000 / per_call_second:,.0f} calls/core)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--seconds", type=int, default=3)
+    parser.add_argument("--skip-baseline", action="store_true", help="skip the slow pure-Python reference")
+    args = parser.parse_args()
+
+    inbound, outbound = make_frames(args.seconds)
+    report("vectorised", run_vectorised(args.calls, inbound, outbound), args.calls, args.seconds)
+    if not args.skip_baseline:
+        baseline_calls = max(1, args.calls // 20)
+        report("pure python", run_pure_python(baseline_calls, inbound, outbound), baseline_calls, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare ``CourtOccupancy`` free counts with the per-slot ``slot_overlaps`` scan.
+
+Both see one court and a day of facility-calendar busy time, so the free
+slots must match exactly; the occupancy path is what ``check_availability``
+and ``iter_free_slots`` run.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_availability --slot-minutes 15 --busy 400
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta
+
+import pytz
+
+from app.availability import CourtOccupancy
+from app.utils.time_utils import generate_slots_for_day, slot_overlaps
+
+
+def legacy_free_slots(slots, busy_intervals):
+    busy_utc = [(i[0].astimezone(pytz.UTC), i[1].astimezone(pytz.UTC)) for i in busy_intervals]
+    result = []
+    for slot in slots:
+        slot_utc = (slot[0].astimezone(pytz.UTC), slot[1].astimezone(pytz.UTC))
+        if slot_overlaps(slot_utc, busy_utc):
+            continue
+        result.append(slot_utc)
+    return result
+
+
+def occupancy_free_slots(slots, busy_intervals):
+    occupancy = CourtOccupancy(slots, [None])
+    occupancy.add_shared_busy(busy_intervals)
+    return [
+        (start.astimezone(pytz.UTC), end.astimezone(pytz.UTC))
+        for (start, end), free in zip(occupancy.slots, occupancy.free_counts())
+        if free > 0
+    ]
+
+
+def make_busy(day: datetime, tz_name: str, count: int, seed: int) -> list[tuple[datetime, datetime]]:
+    rng = random.Random(seed)
+    tz = pytz.timezone(tz_name)
+    day_start = tz.localize(datetime.combine(day.date(), datetime.min.time()))
+    busy = []
+    for _ in range(count):
+        start = day_start + timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+        busy.append((start, start + timedelta(minutes=rng.choice([15, 30, 60, 90, 120]))))
+    return busy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slot-minutes", type=int, default=15)
+    parser.add_argument("--busy", type=int, default=200, help="busy intervals per day")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--tz", default="Asia/Kolkata")
+    args = parser.parse_args()
+
+    day = datetime(2024, 6, 1)
+    slots = generate_slots_for_day(day, ["05:00-12:00", "15:00-23:30"], args.slot_minutes, args.tz)
+    busy = make_busy(day, args.tz, args.busy, seed=7)
+
+    assert occupancy_free_slots(slots, busy) == legacy_free_slots(slots, busy), (
+        "occupancy output diverged from slot_overlaps path"
+    )
+
+    legacy = min(timeit.repeat(lambda: legacy_free_slots(slots, busy), number=args.repeat, repeat=3))
+    occupancy = min(timeit.repeat(lambda: occupancy_free_slots(slots, busy), number=args.repeat, repeat=3))
+
+    print(f"slots={len(slots)} busy={len(busy)}")
+    print(f"slot_overlaps scan: {legacy / args.repeat * 1e6:9.1f} us/call")
+    print(f"CourtOccupancy:     {occupancy / args.repeat * 1e6:9.1f} us/call")
+    print(f"speedup:            {legacy / occupancy:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Fire concurrent bookings at one facility and check that none overlap.
+
+Needs a Postgres database (``DATABASE_URL``); a throwaway facility is seeded
+and deleted again. Two scenarios run:
+
+* ``same``: every request targets the same slot; exactly ``min(N, courts)``
+  bookings must succeed and the rest must come back as slot taken.
+* ``spread``: every request targets a different slot; all must succeed.
+
+    python -m benchmarks.bench_booking_contention --bookings 50 --courts 4 --create-schema
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytz
+from sqlalchemy import delete, text
+
+from app.booking_service import SlotTakenError, create_booking
+from app.db import Base, SessionLocal, engine
+from app.models import Court, Facility, FacilityConfig
+from app.schemas import SlotOption
+
+OVERLAP_CHECK = text(
+    """
+    SELECT count(*) FROM bookings a JOIN bookings b
+      ON a.id < b.id AND a.court_id = b.court_id
+     AND a.status <> 'cancelled' AND b.status <> 'cancelled'
+     AND tstzrange(a.start_time, a.end_time) && tstzrange(b.start_time, b.end_time)
+    WHERE a.facility_id = :facility_id
+    """
+)
+
+
+async def seed_facility(courts: int) -> uuid.UUID:
+    facility = Facility(name="Contention Bench", phone_number=f"+bench-{uuid.uuid4().hex[:12]}")
+    async with SessionLocal() as session:
+        session.add(facility)
+        await session.flush()
+        session.add(
+            FacilityConfig(
+                facility_id=facility.id,
+                open_hours={day: ["00:00-23:59"] for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")},
+                slot_minutes=60,
+                max_courts=courts,
+            )
+        )
+        session.add_all(Court(facility_id=facility.id, name=f"Court {i + 1}") for i in range(courts))
+        await session.commit()
+        return facility.id
+
+
+async def book(facility_id: uuid.UUID, slot: SlotOption, idx: int) -> bool:
+    async with SessionLocal() as session:
+        try:
+            await create_booking(
+                session,
+                facility_id=facility_id,
+                customer_name=f"Bench {idx}",
+                customer_phone=f"+9100000{idx:05d}",
+                slot=slot,
+            )
+        except SlotTakenError:
+            await session.rollback()
+            return False
+        await session.commit()
+        return True
+
+
+async def run_scenario(name: str, facility_id: uuid.UUID, slots: list[SlotOption], expected: int) -> bool:
+    started = time.perf_counter()
+    results = await asyncio.gather(*(book(facility_id, slot, idx) for idx, slot in enumerate(slots)))
+    elapsed = time.perf_counter() - started
+    async with SessionLocal() as session:
+        overlaps = (await session.execute(OVERLAP_CHECK, {"facility_id": facility_id})).scalar_one()
+    booked = sum(results)
+    ok = booked == expected and overlaps == 0
+    print(
+        f"{name:>6}: requests={len(slots)} booked={booked} taken={len(slots) - booked} "
+        f"expected_booked={expected} overlaps={overlaps} "
+        f"throughput={len(slots) / elapsed:.1f}/s wall={elapsed * 1000:.0f}ms {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, default=50)
+    parser.add_argument("--courts", type=int, default=4)
+    parser.add_argument("--create-schema", action="store_true", help="create btree_gist and all tables first")
+    args = parser.parse_args()
+
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+            await conn.run_sync(Base.metadata.create_all)
+
+    facility_id = await seed_facility(args.courts)
+    base = pytz.UTC.localize(datetime.combine(datetime.utcnow().date() + timedelta(days=30), datetime.min.time()))
+    try:
+        same = [SlotOption(start=base, end=base + timedelta(hours=1))] * args.bookings
+        spread = [
+            SlotOption(start=base + timedelta(days=1, hours=i), end=base + timedelta(days=1, hours=i + 1))
+            for i in range(args.bookings)
+        ]
+        ok = await run_scenario("same", facility_id, same, min(args.bookings, args.courts))
+        ok = await run_scenario("spread", facility_id, spread, args.bookings) and ok
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(delete(Facility).where(Facility.id == facility_id))
+            await session.commit()
+        await engine.dispose()
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+"""Many concurrent calls sharing a small DB connection pool.
+
+Each simulated call runs a few ``check_availability`` tool calls separated
+by caller think time, the way a phone conversation does. Two strategies:
+
+* ``per-call``: one session opened for the whole call (the old
+  ``RealtimeClient`` behaviour), which pins a connection after its first query.
+* ``per-tool``: ``RealtimeClient._run_tool``, which checks a connection out
+  only while a tool runs.
+
+The facility cache is invalidated before every tool call so each one
+really queries the database (a cold cache is the worst case for the pool).
+
+Needs a Postgres database (``DATABASE_URL``); a throwaway facility is seeded
+and deleted again.
+
+    python -m benchmarks.bench_call_sessions --calls 200 --pool-size 5 --create-schema
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.ai import tools
+from app.ai.realtime_client import RealtimeClient
+from app.booking_service import invalidate_facility_cache
+from app.config import get_settings
+from app.db import Base, SessionLocal
+from app.models import Facility
+from benchmarks.bench_booking_contention import seed_facility
+
+
+class CallStats:
+    def __init__(self) -> None:
+        self.completed = 0
+        self.failed = 0
+        self.tool_ms: List[float] = []
+        self.peak_checked_out = 0
+
+
+async def _simulate_call(strategy: str, facility_id, args: argparse.Namespace, stats: CallStats) -> None:
+    day = (datetime.utcnow() + timedelta(days=random.randint(1, 14))).date().isoformat()
+    tool_args = {"date": day}
+    client = RealtimeClient(SimpleNamespace(id=facility_id), SimpleNamespace())
+    try:
+        if strategy == "per-call":
+            async with SessionLocal() as session:
+                for _ in range(args.tools):
+                    await asyncio.sleep(random.uniform(0.5, 1.5) * args.think)
+                    invalidate_facility_cache(facility_id)
+                    started = time.perf_counter()
+                    await tools.check_availability_tool(session, facility_id, datetime.fromisoformat(day))
+                    stats.tool_ms.append((time.perf_counter() - started) * 1000)
+        else:
+            for _ in range(args.tools):
+                await asyncio.sleep(random.uniform(0.5, 1.5) * args.think)
+                invalidate_facility_cache(facility_id)
+                started = time.perf_counter()
+                await client._run_tool("check_availability", tool_args)
+                stats.tool_ms.append((time.perf_counter() - started) * 1000)
+        stats.completed += 1
+    except Exception as exc:
+        stats.failed += 1
+        if stats.failed == 1:
+            print(f"  first failure: {type(exc).__name__}: {exc}")
+
+
+async def _watch_pool(engine, stats: CallStats) -> None:
+    while True:
+        stats.peak_checked_out = max(stats.peak_checked_out, engine.pool.checkedout())
+        await asyncio.sleep(0.01)
+
+
+async def run_strategy(strategy: str, facility_id, engine, args: argparse.Namespace) -> bool:
+    stats = CallStats()
+    watcher = asyncio.create_task(_watch_pool(engine, stats))
+    started = time.perf_counter()
+    await asyncio.gather(*(_simulate_call(strategy, facility_id, args, stats) for _ in range(args.calls)))
+    elapsed = time.perf_counter() - started
+    watcher.cancel()
+    ordered = sorted(stats.tool_ms) or [0.0]
+    print(
+        f"{strategy:>8}: {stats.completed}/{args.calls} calls completed, {stats.failed} failed, "
+        f"peak {stats.peak_checked_out}/{args.pool_size} connections, "
+        f"tool p50 {statistics.median(ordered):.1f} ms p95 {ordered[int(0.95 * (len(ordered) - 1))]:.1f} ms, "
+        f"{elapsed:.1f}s wall"
+    )
+    return stats.failed == 0
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--tools", type=int, default=3, help="tool calls per simulated call")
+    parser.add_argument("--think", type=float, default=1.0, help="mean seconds between tool calls")
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    parser.add_argument("--strategy", choices=["per-call", "per-tool", "both"], default="both")
+    parser.add_argument("--create-schema", action="store_true", help="create all tables first")
+    args = parser.parse_args()
+
+    engine = create_async_engine(
+        get_settings().database_url, pool_size=args.pool_size, max_overflow=0, pool_timeout=args.pool_timeout
+    )
+    SessionLocal.configure(bind=engine)
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+            await conn.run_sync(Base.metadata.create_all)
+
+    facility_id = await seed_facility(4)
+    ok = True
+    try:
+        strategies = ["per-call", "per-tool"] if args.strategy == "both" else [args.strategy]
+        for strategy in strategies:
+            passed = await run_strategy(strategy, facility_id, engine, args)
+            ok = ok and (passed or strategy == "per-call")
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(delete(Facility).where(Facility.id == facility_id))
+            await session.commit()
+        await engine.dispose()
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
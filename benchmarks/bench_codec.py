@@ -0,0 +1,99 @@
+"""Per-frame JSON overhead on the websocket hot paths.
+
+Compares stdlib ``json`` against ``app.utils.codec`` for the three messages
+every call handles many times a second: an inbound Twilio media frame, an
+outbound Twilio media frame and a Realtime ``response.audio.delta``.
+
+    python -m benchmarks.bench_codec --frames 200000
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import time
+from typing import Callable
+
+from app.utils import codec
+
+STREAM_SID = "MZ18ad3ab5a668481ce02b83e7395059f0"
+
+
+def twilio_frame(seq: int) -> str:
+    payload = base64.b64encode(os.urandom(160)).decode("ascii")
+    return json.dumps(
+        {
+            "event": "media",
+            "sequenceNumber": str(seq),
+            "media": {"track": "inbound", "chunk": str(seq), "timestamp": str(seq * 20), "payload": payload},
+            "streamSid": STREAM_SID,
+        },
+        separators=(",", ":"),
+    )
+
+
+def audio_delta() -> str:
+    delta = base64.b64encode(os.urandom(4800)).decode("ascii")
+    return json.dumps(
+        {
+            "type": "response.audio.delta",
+            "event_id": "event_4321",
+            "response_id": "resp_001",
+            "item_id": "item_001",
+            "output_index": 0,
+            "content_index": 0,
+            "delta": delta,
+        },
+        separators=(",", ":"),
+    )
+
+
+def timed(frames: int, fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - started) / frames * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=100000)
+    args = parser.parse_args()
+
+    inbound = twilio_frame(42)
+    delta = audio_delta()
+    outbound_payload = base64.b64encode(os.urandom(160)).decode("ascii")
+    assert codec.parse_twilio_event(inbound)[1] == json.loads(inbound)["media"]["payload"]
+    assert codec.peek_audio_delta(delta) == json.loads(delta)["delta"]
+    assert json.loads(codec.twilio_media_message(STREAM_SID, outbound_payload)) == {
+        "event": "media",
+        "streamSid": STREAM_SID,
+        "media": {"payload": outbound_payload},
+    }
+
+    cases = [
+        ("twilio inbound", "json.loads", lambda: json.loads(inbound)["media"]["payload"]),
+        ("twilio inbound", f"codec.loads ({codec.BACKEND})", lambda: codec.loads(inbound)["media"]["payload"]),
+        ("twilio inbound", "parse_twilio_event", lambda: codec.parse_twilio_event(inbound)[1]),
+        (
+            "twilio outbound",
+            "json.dumps",
+            lambda: json.dumps({"event": "media", "streamSid": STREAM_SID, "media": {"payload": outbound_payload}}),
+        ),
+        (
+            "twilio outbound",
+            f"codec.dumps ({codec.BACKEND})",
+            lambda: codec.dumps({"event": "media", "streamSid": STREAM_SID, "media": {"payload": outbound_payload}}),
+        ),
+        ("twilio outbound", "twilio_media_message", lambda: codec.twilio_media_message(STREAM_SID, outbound_payload)),
+        ("realtime delta", "json.loads", lambda: json.loads(delta)["delta"]),
+        ("realtime delta", f"codec.loads ({codec.BACKEND})", lambda: codec.loads(delta)["delta"]),
+        ("realtime delta", "peek_audio_delta", lambda: codec.peek_audio_delta(delta)),
+    ]
+    for path, name, fn in cases:
+        print(f"{path:>16}  {name:<28} {timed(args.frames, fn):7.3f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
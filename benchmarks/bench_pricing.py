@@ -0,0 +1,114 @@
+"""Cost of pricing on the availability path.
+
+Compiles a representative ``pricing_rules`` document and times:
+
+* one slot priced with ``PriceTable.price`` and with the batched
+  ``PriceTable.prices`` (after checking both agree);
+* a whole ``check_availability`` call for a facility with and without
+  ``pricing_rules``. The facility is cached, the calendar is an in-memory
+  fake and the bookings query is answered without a database, so the
+  figures are the CPU cost of the call and the pricing share is an upper
+  bound on what a real call (which adds a Postgres round trip) sees.
+
+    python -m benchmarks.bench_pricing --slot-minutes 30
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import timeit
+import uuid
+from datetime import datetime, timedelta
+
+from app import booking_service
+from app.booking_service import FacilityWithConfig, check_availability
+from app.busy_store import busy_store
+from app.models import Facility, FacilityConfig
+from app.pricing import compile_pricing
+from app.utils.time_utils import WEEKDAY_KEYS, generate_slots_for_day
+from benchmarks.fake_calendar import FakeCalendarBackend
+
+RULES = {
+    "currency": "INR",
+    "base_rate": 400,
+    "weekend_rate": 500,
+    "peak": [
+        {"days": ["mon", "tue", "wed", "thu", "fri"], "hours": "06:00-09:00", "rate": 550},
+        {"days": ["mon", "tue", "wed", "thu", "fri"], "hours": "17:00-22:00", "rate": 600},
+        {"days": ["sat", "sun"], "hours": "07:00-12:00", "rate": 650},
+    ],
+    "court_multipliers": {"Court 1": 1.25},
+    "duration_discounts": [{"min_minutes": 120, "percent": 10}, {"min_minutes": 180, "percent": 15}],
+}
+
+
+class _NoBookings:
+    """Stands in for the session: the only query left with a cached facility is the bookings read."""
+
+    async def execute(self, statement):
+        return self
+
+    def all(self):
+        return []
+
+
+def _facility(slot_minutes: int, tz: str, rules) -> FacilityWithConfig:
+    facility = Facility(id=uuid.uuid4(), name="Pricing Bench", phone_number=f"+bench-{uuid.uuid4().hex[:12]}", timezone=tz)
+    config = FacilityConfig(
+        facility_id=facility.id,
+        open_hours={day: ["05:00-23:30"] for day in WEEKDAY_KEYS},
+        slot_minutes=slot_minutes,
+        max_courts=4,
+        pricing_rules=rules,
+        google_calendar_mode="single_calendar",
+    )
+    return FacilityWithConfig(facility=facility, config=config)
+
+
+async def _time_availability(entries, day: datetime, number: int, repeat: int):
+    """Best seconds per call for each entry; rounds alternate between entries so drift hits both alike."""
+    session = _NoBookings()
+    best = [float("inf")] * len(entries)
+    for _ in range(repeat):
+        for idx, entry in enumerate(entries):
+            booking_service._facility_cache.set(entry.facility.id, entry)
+            await check_availability(session, entry.facility.id, day)  # first calendar sync
+            started = time.perf_counter()
+            for _ in range(number):
+                await check_availability(session, entry.facility.id, day)
+            best[idx] = min(best[idx], (time.perf_counter() - started) / number)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slot-minutes", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--tz", default="Asia/Kolkata")
+    args = parser.parse_args()
+
+    compile_seconds = min(timeit.repeat(lambda: compile_pricing(RULES), number=20, repeat=3)) / 20
+    table = compile_pricing(RULES)
+    slots = generate_slots_for_day(datetime(2024, 6, 3), ["05:00-23:30"], args.slot_minutes, args.tz)
+    assert table.prices(slots) == [table.price(s, e) for s, e in slots], "prices() diverged from price()"
+
+    per_slot = min(timeit.repeat(lambda: [table.price(s, e) for s, e in slots], number=args.repeat, repeat=3))
+    batched = min(timeit.repeat(lambda: table.prices(slots), number=args.repeat, repeat=3))
+
+    busy_store._backend = FakeCalendarBackend()
+    day = datetime.now() + timedelta(days=2)
+    plain_entry = _facility(args.slot_minutes, args.tz, None)
+    priced_entry = _facility(args.slot_minutes, args.tz, RULES)
+    plain, priced = asyncio.run(_time_availability([plain_entry, priced_entry], day, max(1, args.repeat // 20), 20))
+
+    print(f"compile rules:              {compile_seconds * 1e3:8.2f} ms (once per config load)")
+    print(f"price(), one call per slot: {per_slot / args.repeat / len(slots) * 1e6:8.2f} us/slot")
+    print(f"prices(), whole list:       {batched / args.repeat / len(slots) * 1e6:8.2f} us/slot")
+    print(f"check_availability, {len(slots)} slots:")
+    print(f"  without pricing_rules:    {plain * 1e6:8.1f} us/call")
+    print(f"  with pricing_rules:       {priced * 1e6:8.1f} us/call ({(priced / plain - 1) * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
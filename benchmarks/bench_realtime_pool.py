@@ -0,0 +1,86 @@
+"""Time from call arrival to a ready Realtime session, cold vs pre-warmed.
+
+Runs against ``benchmarks.fake_realtime`` with a simulated session start-up
+delay. "Ready" means connected, tools registered and the facility prompt
+sent, i.e. what ``RealtimeClient.connect`` does before audio can flow.
+
+    python -m benchmarks.bench_realtime_pool --calls 50 --rate 5 --setup-ms 400
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from functools import partial
+from typing import List
+
+from app.ai.realtime_pool import RealtimeSessionPool, open_realtime_session
+from benchmarks.fake_realtime import FakeRealtimeServer
+
+PROMPT = {"type": "system", "content": "You are the receptionist for a test facility."}
+
+
+async def _call(acquire, latencies: List[float]) -> None:
+    started = time.perf_counter()
+    ws = await acquire()
+    await ws.send(json.dumps(PROMPT))
+    latencies.append((time.perf_counter() - started) * 1000)
+    await asyncio.sleep(0.05)
+    await ws.close()
+
+
+async def _run_calls(acquire, calls: int, rate: float) -> List[float]:
+    latencies: List[float] = []
+    tasks = []
+    for _ in range(calls):
+        tasks.append(asyncio.create_task(_call(acquire, latencies)))
+        await asyncio.sleep(1 / rate)
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+def _report(name: str, latencies: List[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(f"{name:>6}: p50 {statistics.median(ordered):7.1f} ms  p95 {p95:7.1f} ms  max {ordered[-1]:7.1f} ms")
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = FakeRealtimeServer(setup_ms=args.setup_ms)
+    await server.start()
+    opener = partial(open_realtime_session, url=server.url, api_key="test")
+
+    _report("cold", await _run_calls(opener, args.calls, args.rate))
+
+    pool = RealtimeSessionPool(
+        min_size=args.min_size,
+        max_size=args.max_size,
+        horizon_seconds=args.horizon,
+        max_idle_seconds=600,
+        health_interval=5,
+        opener=opener,
+    )
+    pool.start()
+    await asyncio.sleep(args.setup_ms / 1000 + 0.2)
+    _report("pooled", await _run_calls(pool.acquire, args.calls, args.rate))
+    print(f"pool: {pool.stats}, idle now {pool.idle}, target {pool.target_size()}")
+    await pool.stop()
+    await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=5.0, help="call arrivals per second")
+    parser.add_argument("--setup-ms", type=float, default=400.0)
+    parser.add_argument("--min-size", type=int, default=1)
+    parser.add_argument("--max-size", type=int, default=20)
+    parser.add_argument("--horizon", type=float, default=2.0, help="pool sizing horizon in seconds")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Minimal fake of the Google Calendar v3 HTTP API.
+
+Serves ``POST /freeBusy`` and ``GET``/``POST /calendars/{id}/events`` (with
+sync tokens) from memory so ``app.calendar_client.CalendarClient`` can be
+exercised without Google. Use it in-process through
+``httpx.ASGITransport(app=create_app())``, skip HTTP entirely with
+``FakeCalendarBackend`` (e.g. ``BusyIntervalStore(backend=...)``), or run it
+as a server and set ``GOOGLE_CALENDAR_BASE_URL``:
+
+    python -m benchmarks.fake_calendar --port 8081 --latency-ms 80
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from app.calendar_client import CalendarEvent, EventPage, SyncTokenExpired
+
+
+def _parse(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class FakeCalendarState:
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.events: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self.requests = 0
+        # Change log per calendar; a sync token is an index into it.
+        self.changes: Dict[str, List[str]] = defaultdict(list)
+        self.expired_tokens: set[str] = set()
+
+    def _touch(self, calendar_id: str, event_id: str) -> None:
+        self.changes[calendar_id].append(event_id)
+
+    def sync_token(self, calendar_id: str) -> str:
+        return f"{calendar_id}:{len(self.changes[calendar_id])}"
+
+    def add_event(self, calendar_id: str, start: datetime, end: datetime, event_id: Optional[str] = None) -> str:
+        event_id = event_id or uuid.uuid4().hex
+        self.events[calendar_id][event_id] = {
+            "id": event_id,
+            "status": "confirmed",
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": end.isoformat()},
+        }
+        self._touch(calendar_id, event_id)
+        return event_id
+
+    def cancel_event(self, calendar_id: str, event_id: str) -> None:
+        self.events[calendar_id][event_id]["status"] = "cancelled"
+        self._touch(calendar_id, event_id)
+
+    def list_items(
+        self,
+        calendar_id: str,
+        sync_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+        time_max: Optional[datetime] = None,
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Return (items, next_sync_token); raises KeyError for an expired token."""
+        events = self.events.get(calendar_id, {})
+        if sync_token:
+            if sync_token in self.expired_tokens:
+                raise KeyError(sync_token)
+            since = int(sync_token.rsplit(":", 1)[1])
+            changed = dict.fromkeys(self.changes[calendar_id][since:])
+            items = [events[event_id] for event_id in changed]
+        else:
+            items = []
+            for event in events.values():
+                if event["status"] == "cancelled":
+                    continue
+                start, end = _parse(event["start"]["dateTime"]), _parse(event["end"]["dateTime"])
+                if (time_max is None or start < time_max) and (time_min is None or time_min < end):
+                    items.append(event)
+        return items, self.sync_token(calendar_id)
+
+    def busy(self, calendar_id: str, time_min: datetime, time_max: datetime) -> List[Dict[str, str]]:
+        busy = []
+        for event in self.events.get(calendar_id, {}).values():
+            if event["status"] == "cancelled":
+                continue
+            start, end = _parse(event["start"]["dateTime"]), _parse(event["end"]["dateTime"])
+            if start < time_max and time_min < end:
+                busy.append({"start": start.isoformat(), "end": end.isoformat()})
+        return sorted(busy, key=lambda b: b["start"])
+
+
+class FakeCalendarBackend:
+    """In-process stand-in for ``CalendarClient`` backed by ``FakeCalendarState``."""
+
+    def __init__(self, state: Optional[FakeCalendarState] = None):
+        self.state = state or FakeCalendarState()
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        sync_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+        time_max: Optional[datetime] = None,
+    ) -> EventPage:
+        self.state.requests += 1
+        try:
+            items, next_token = self.state.list_items(calendar_id, sync_token, time_min, time_max)
+        except KeyError:
+            raise SyncTokenExpired("Calendar sync token expired", status_code=410)
+        events = [
+            CalendarEvent(
+                id=item["id"],
+                start=_parse(item["start"]["dateTime"]),
+                end=_parse(item["end"]["dateTime"]),
+                cancelled=item["status"] == "cancelled",
+            )
+            for item in items
+        ]
+        return EventPage(events=events, next_sync_token=next_token)
+
+    async def freebusy(
+        self, calendar_ids: Sequence[str], time_min: datetime, time_max: datetime
+    ) -> Dict[str, List[Tuple[datetime, datetime]]]:
+        self.state.requests += 1
+        return {
+            calendar_id: [(_parse(b["start"]), _parse(b["end"])) for b in self.state.busy(calendar_id, time_min, time_max)]
+            for calendar_id in calendar_ids
+        }
+
+
+def create_app(state: Optional[FakeCalendarState] = None) -> FastAPI:
+    state = state or FakeCalendarState()
+    app = FastAPI(title="Fake Google Calendar")
+    app.state.calendar = state
+
+    async def simulate() -> None:
+        state.requests += 1
+        if state.latency_ms:
+            await asyncio.sleep(state.latency_ms / 1000)
+        if state.error_rate and random.random() < state.error_rate:
+            raise HTTPException(status_code=503, detail="injected failure")
+
+    @app.post("/freeBusy")
+    async def freebusy(request: Request) -> Dict[str, Any]:
+        await simulate()
+        body = await request.json()
+        time_min, time_max = _parse(body["timeMin"]), _parse(body["timeMax"])
+        return {
+            "kind": "calendar#freeBusy",
+            "timeMin": body["timeMin"],
+            "timeMax": body["timeMax"],
+            "calendars": {
+                item["id"]: {"busy": state.busy(item["id"], time_min, time_max)} for item in body.get("items", [])
+            },
+        }
+
+    @app.get("/calendars/{calendar_id:path}/events")
+    async def list_events(calendar_id: str, request: Request) -> Any:
+        await simulate()
+        params = request.query_params
+        try:
+            items, next_token = state.list_items(
+                calendar_id,
+                sync_token=params.get("syncToken"),
+                time_min=_parse(params["timeMin"]) if "timeMin" in params else None,
+                time_max=_parse(params["timeMax"]) if "timeMax" in params else None,
+            )
+        except KeyError:
+            return JSONResponse(status_code=410, content={"error": {"code": 410, "message": "Sync token expired"}})
+        return {"kind": "calendar#events", "timeZone": "UTC", "items": items, "nextSyncToken": next_token}
+
+    @app.post("/calendars/{calendar_id:path}/events")
+    async def insert_event(calendar_id: str, request: Request) -> Dict[str, Any]:
+        await simulate()
+        body = await request.json()
+        if body.get("id") and body["id"] in state.events.get(calendar_id, {}):
+            return JSONResponse(status_code=409, content={"error": {"code": 409, "message": "The requested identifier already exists."}})
+        event_id = state.add_event(
+            calendar_id, _parse(body["start"]["dateTime"]), _parse(body["end"]["dateTime"]), body.get("id")
+        )
+        return {**state.events[calendar_id][event_id], "summary": body.get("summary")}
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(FakeCalendarState(args.latency_ms, args.error_rate)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Minimal fake of the OpenAI Realtime websocket endpoint.
+
+Accepts any bearer token, waits ``setup_ms`` (the server-side session
+start-up the real API spends before ``session.created``), then records every
+client message by type. Sessions are closed after ``session_ttl`` seconds to
+mimic the server-side session limit. Use it in-process with
+``FakeRealtimeServer`` or run it and point ``OPENAI_REALTIME_URL`` at it:
+
+    python -m benchmarks.fake_realtime --port 8082 --setup-ms 400
+
+With ``script=True`` each session also plays a booking conversation: a
+spoken greeting once the facility prompt arrives, then, after
+``turn_seconds`` of caller audio, ``check_availability`` for a day in the
+coming week followed by ``create_booking`` for one of the returned slots,
+and a spoken confirmation. Tool round-trip times are kept per tool.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+AUDIO_CHUNK_MS = 100
+# 100 ms of 24 kHz PCM16 (a quiet tone, so it survives resampling and encoding).
+_AUDIO_CHUNK = base64.b64encode(
+    b"".join(int(2000 * ((i // 12) % 2 * 2 - 1)).to_bytes(2, "little", signed=True) for i in range(2400))
+).decode("ascii")
+
+
+def _event(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":"))
+
+
+class _ScriptedSession:
+    def __init__(self, server: "FakeRealtimeServer", ws: ServerConnection):
+        self.server = server
+        self.ws = ws
+        self.appends = 0
+        self.stage = "waiting"
+        self.pending: Dict[str, tuple[str, float]] = {}
+
+    async def speak(self, ms: int, transcript: str) -> None:
+        await self.ws.send(_event({"type": "response.created", "response": {"id": "resp"}}))
+        for _ in range(max(1, ms // AUDIO_CHUNK_MS)):
+            await self.ws.send(_event({"type": "response.audio.delta", "response_id": "resp", "delta": _AUDIO_CHUNK}))
+        await self.ws.send(_event({"type": "response.audio.done"}))
+        await self.ws.send(_event({"type": "response.audio_transcript.done", "transcript": transcript}))
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> None:
+        tool_id = f"call_{uuid.uuid4().hex[:12]}"
+        self.pending[tool_id] = (name, time.perf_counter())
+        await self.ws.send(_event({"type": "tool_call", "id": tool_id, "name": name, "arguments": arguments}))
+
+    async def handle(self, event: Dict[str, Any]) -> None:
+        kind = event.get("type")
+        if kind == "system" and self.stage == "waiting":
+            self.stage = "listening"
+            await self.speak(self.server.greeting_ms, "Hello! How can I help you today?")
+        elif kind == "input_audio_buffer.append" and self.stage == "listening":
+            self.appends += 1
+            if self.appends * 20 >= self.server.turn_seconds * 1000:
+                self.stage = "checking"
+                await self.ws.send(_event({"type": "input_audio_buffer.speech_started"}))
+                await self.ws.send(_event({"type": "input_audio_buffer.speech_stopped"}))
+                await self.ws.send(
+                    _event({"type": "conversation.item.input_audio_transcription.completed", "transcript": "A court please"})
+                )
+                day = date.today() + timedelta(days=random.randint(1, 7))
+                await self.call_tool("check_availability", {"date": day.isoformat()})
+        elif kind == "tool_result":
+            name, sent_at = self.pending.pop(event.get("tool_id"), ("unknown", time.perf_counter()))
+            self.server.tool_latencies[name].append(time.perf_counter() - sent_at)
+            result = event.get("result")
+            if name == "check_availability" and isinstance(result, list) and result:
+                slot = random.choice(result[:10])
+                await self.call_tool(
+                    "create_booking",
+                    {
+                        "customer_name": "Load Test",
+                        "customer_phone": f"+9199{random.randint(0, 99999999):08d}",
+                        "start": slot["start"],
+                        "end": slot["end"],
+                    },
+                )
+            else:
+                self.stage = "done"
+                self.server.outcomes[
+                    "booked" if isinstance(result, dict) and result.get("booking_id") else f"{name}:no_booking"
+                ] += 1
+                await self.speak(self.server.greeting_ms, "All done, see you on court.")
+
+
+class FakeRealtimeServer:
+    def __init__(
+        self,
+        setup_ms: float = 0.0,
+        session_ttl: Optional[float] = None,
+        script: bool = False,
+        greeting_ms: int = 1500,
+        turn_seconds: float = 2.0,
+    ):
+        self.setup_ms = setup_ms
+        self.session_ttl = session_ttl
+        self.script = script
+        self.greeting_ms = greeting_ms
+        self.turn_seconds = turn_seconds
+        self.sessions_started = 0
+        self.open_sessions = 0
+        self.messages: Counter[str] = Counter()
+        self.tool_latencies: Dict[str, List[float]] = defaultdict(list)
+        self.outcomes: Counter[str] = Counter()
+        self._server: Optional[Server] = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "server not started"
+        host, port = list(self._server.sockets)[0].getsockname()[:2]
+        return f"ws://{host}:{port}/v1/realtime"
+
+    async def _expire(self, ws: ServerConnection) -> None:
+        await asyncio.sleep(self.session_ttl)
+        await ws.close(code=1000, reason="session expired")
+
+    async def _handle(self, ws: ServerConnection) -> None:
+        self.sessions_started += 1
+        self.open_sessions += 1
+        expiry = asyncio.create_task(self._expire(ws)) if self.session_ttl else None
+        session = _ScriptedSession(self, ws) if self.script else None
+        try:
+            await asyncio.sleep(self.setup_ms / 1000)
+            await ws.send(json.dumps({"type": "session.created", "session": {"id": f"sess_{uuid.uuid4().hex}"}}))
+            async for message in ws:
+                event = json.loads(message)
+                self.messages[event.get("type", "unknown")] += 1
+                if session is not None:
+                    await session.handle(event)
+        except ConnectionClosed:
+            pass
+        finally:
+            self.open_sessions -= 1
+            if expiry:
+                expiry.cancel()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = await serve(self._handle, host, port, max_size=None)
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def _serve_forever(args: argparse.Namespace) -> None:
+    server = FakeRealtimeServer(args.setup_ms, args.session_ttl, script=args.script)
+    await server.start(args.host, args.port)
+    print(f"Fake Realtime API listening on {server.url}")
+    await asyncio.Future()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--setup-ms", type=float, default=0.0)
+    parser.add_argument("--session-ttl", type=float, default=None)
+    parser.add_argument("--script", action="store_true", help="play a scripted booking conversation per session")
+    args = parser.parse_args()
+    asyncio.run(_serve_forever(args))
+
+
+if __name__ == "__main__":
+    main()
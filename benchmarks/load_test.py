@@ -0,0 +1,282 @@
+"""End-to-end load test: simulated Twilio calls against the real app.
+
+Starts ``app.main`` under uvicorn in a child process, wired to an in-process
+scripted ``FakeRealtimeServer`` and a ``fake_calendar`` server, seeds a
+throwaway facility (deleted again afterwards) and places ``--calls`` calls,
+``--concurrency`` at a time. Each call goes through ``POST /twilio/voice``,
+opens the media stream from the returned TwiML and streams mu-law caller
+audio in real time (20 ms frames) while the fake model greets the caller,
+runs ``check_availability`` and ``create_booking`` and confirms.
+
+Reports p50/p99 time-to-first-word (stream start to the first AI media
+frame), webhook and tool round-trip latency, and the app process's CPU time
+and RSS growth per call. Needs a Postgres database (``DATABASE_URL``) with
+the schema in place and Linux ``/proc`` for the process figures.
+
+    python -m benchmarks.load_test --calls 200 --concurrency 50 --realtime-setup-ms 400
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import math
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+from sqlalchemy import delete
+from websockets.asyncio.client import connect
+
+from app.db import SessionLocal, engine
+from app.models import Facility
+from app.telephony.audio import PCM16_TO_ULAW
+from benchmarks.bench_booking_contention import seed_facility
+from benchmarks.fake_realtime import FakeRealtimeServer
+
+FRAME_SAMPLES = 160
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def synthetic_speech(seconds: float) -> List[bytes]:
+    """Caller audio: syllable-length voiced bursts over low background noise, as mu-law frames."""
+    rng = np.random.default_rng(7)
+    n = int(seconds * 8000)
+    t = np.arange(n) / 8000
+    envelope = (np.sin(2 * np.pi * 3 * t) > -0.3).astype(np.float64)
+    voiced = np.sin(2 * np.pi * 140 * t) + 0.5 * np.sin(2 * np.pi * 280 * t) + 0.3 * np.sin(2 * np.pi * 700 * t)
+    pcm = 6000 * envelope * voiced + rng.normal(0, 30, n)
+    ulaw = PCM16_TO_ULAW[np.clip(pcm, -32768, 32767).astype(np.int16).view(np.uint16)].tobytes()
+    return [ulaw[i : i + FRAME_SAMPLES] for i in range(0, len(ulaw) - FRAME_SAMPLES + 1, FRAME_SAMPLES)]
+
+
+def load_audio(path: str) -> List[bytes]:
+    with open(path, "rb") as fh:
+        ulaw = fh.read()
+    return [ulaw[i : i + FRAME_SAMPLES] for i in range(0, len(ulaw) - FRAME_SAMPLES + 1, FRAME_SAMPLES)]
+
+
+class ProcessSampler:
+    """CPU seconds and RSS of one process, read from ``/proc``."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._ticks = os.sysconf("SC_CLK_TCK")
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as fh:
+            fields = fh.read().rsplit(")", 1)[1].split()
+        # utime and stime are fields 14 and 15; the split starts at field 3.
+        return (int(fields[11]) + int(fields[12])) / self._ticks
+
+    def rss_mb(self) -> float:
+        with open(f"/proc/{self.pid}/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+
+
+class CallResult:
+    __slots__ = ("webhook", "first_word", "error")
+
+    def __init__(self) -> None:
+        self.webhook: Optional[float] = None
+        self.first_word: Optional[float] = None
+        self.error: Optional[str] = None
+
+
+async def place_call(
+    http: httpx.AsyncClient, base_ws: str, to_number: str, frames: List[bytes], hold_seconds: float
+) -> CallResult:
+    result = CallResult()
+    call_sid = f"CA{uuid.uuid4().hex}"
+    started = time.perf_counter()
+    response = await http.post(
+        "/twilio/voice", data={"From": "+15555550100", "To": to_number, "CallSid": call_sid}
+    )
+    result.webhook = time.perf_counter() - started
+    if response.status_code != 200:
+        result.error = f"webhook {response.status_code}"
+        return result
+    stream = ET.fromstring(response.text).find("./Connect/Stream")
+    params = {p.get("name"): p.get("value") for p in stream.findall("Parameter")}
+    stream_sid = f"MZ{uuid.uuid4().hex}"
+
+    async with connect(base_ws + stream.get("url"), max_size=None) as ws:
+        first_word = asyncio.get_running_loop().create_future()
+
+        async def receive() -> None:
+            async for message in ws:
+                if not first_word.done() and '"event":"media"' in message:
+                    first_word.set_result(time.perf_counter())
+
+        receiver = asyncio.create_task(receive())
+        stream_started = time.perf_counter()
+        await ws.send(
+            f'{{"event":"start","streamSid":"{stream_sid}","start":{{"streamSid":"{stream_sid}",'
+            f'"callSid":"{call_sid}","customParameters":{{"call_id":"{params["call_id"]}",'
+            f'"facility_id":"{params["facility_id"]}"}}}}}}'
+        )
+        # Real-time pacing against a deadline so slow sends do not stretch the call.
+        deadline = time.perf_counter()
+        total = int(hold_seconds * 50)
+        for seq in range(total):
+            payload = base64.b64encode(frames[seq % len(frames)]).decode("ascii")
+            await ws.send(
+                f'{{"event":"media","sequenceNumber":"{seq}","media":{{"track":"inbound","chunk":"{seq}",'
+                f'"timestamp":"{seq * 20}","payload":"{payload}"}},"streamSid":"{stream_sid}"}}'
+            )
+            deadline += 0.02
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await ws.send(f'{{"event":"stop","streamSid":"{stream_sid}"}}')
+        if first_word.done():
+            result.first_word = first_word.result() - stream_started
+        else:
+            result.error = "no audio"
+        receiver.cancel()
+    return result
+
+
+def percentiles(values: List[float]) -> Tuple[float, float]:
+    if not values:
+        return math.nan, math.nan
+    ordered = sorted(values)
+    p99_index = min(len(ordered) - 1, math.ceil(0.99 * len(ordered)) - 1)
+    return statistics.median(ordered), ordered[p99_index]
+
+
+def report_line(label: str, values: List[float]) -> str:
+    p50, p99 = percentiles(values)
+    return f"{label:<28} n={len(values):<5} p50={p50 * 1000:8.1f} ms  p99={p99 * 1000:8.1f} ms"
+
+
+async def wait_ready(http: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"process exited with {process.returncode}")
+        try:
+            await http.get("/metrics")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("app did not come up")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--hold-seconds", type=float, default=8.0, help="caller audio streamed per call")
+    parser.add_argument("--realtime-setup-ms", type=float, default=400.0)
+    parser.add_argument("--calendar-latency-ms", type=float, default=80.0)
+    parser.add_argument("--courts", type=int, default=8)
+    parser.add_argument("--audio", help="raw 8 kHz mu-law file to stream instead of synthetic speech")
+    args = parser.parse_args()
+
+    frames = load_audio(args.audio) if args.audio else synthetic_speech(10.0)
+    realtime = FakeRealtimeServer(setup_ms=args.realtime_setup_ms, script=True)
+    await realtime.start()
+
+    calendar_port, app_port = free_port(), free_port()
+    calendar = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_calendar", "--port", str(calendar_port)]
+        + ["--latency-ms", str(args.calendar_latency_ms)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    facility_id = await seed_facility(args.courts)
+    async with SessionLocal() as session:
+        to_number = (await session.get(Facility, facility_id)).phone_number
+
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY="load-test",
+        OPENAI_REALTIME_URL=realtime.url,
+        GOOGLE_CALENDAR_BASE_URL=f"http://127.0.0.1:{calendar_port}",
+        GOOGLE_CALENDAR_ID="load-test",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(app_port), "--log-level", "warning"],
+        env=env,
+    )
+    sampler = ProcessSampler(server.pid)
+    results: List[CallResult] = []
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{app_port}", timeout=30.0) as http:
+            await wait_ready(http, server)
+            base_ws = f"ws://127.0.0.1:{app_port}"
+            # One warm-up call so imports, pools and caches are not billed to the run.
+            await place_call(http, base_ws, to_number, frames, 1.0)
+            await asyncio.sleep(1.0)
+            for values in realtime.tool_latencies.values():
+                values.clear()
+            realtime.outcomes.clear()
+
+            cpu_before, rss_before = sampler.cpu_seconds(), sampler.rss_mb()
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def one_call() -> None:
+                async with semaphore:
+                    try:
+                        results.append(await place_call(http, base_ws, to_number, frames, args.hold_seconds))
+                    except Exception as exc:
+                        failed = CallResult()
+                        failed.error = repr(exc)
+                        results.append(failed)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one_call() for _ in range(args.calls)))
+            wall = time.perf_counter() - started
+            cpu_used, rss_after = sampler.cpu_seconds() - cpu_before, sampler.rss_mb()
+    finally:
+        server.terminate()
+        calendar.terminate()
+        server.wait()
+        calendar.wait()
+        await realtime.stop()
+        async with SessionLocal() as session:
+            await session.execute(delete(Facility).where(Facility.id == facility_id))
+            await session.commit()
+        await engine.dispose()
+
+    errors: Dict[str, int] = {}
+    for result in results:
+        if result.error:
+            errors[result.error] = errors.get(result.error, 0) + 1
+    print(
+        f"{args.calls} calls, concurrency {args.concurrency}, {args.hold_seconds:.0f}s of caller audio each, "
+        f"{wall:.1f}s wall"
+    )
+    print(report_line("webhook", [r.webhook for r in results if r.webhook is not None]))
+    print(report_line("time to first word", [r.first_word for r in results if r.first_word is not None]))
+    for name, values in sorted(realtime.tool_latencies.items()):
+        print(report_line(f"tool {name}", values))
+    print(f"{'outcomes':<28} {dict(realtime.outcomes)}")
+    if errors:
+        print(f"{'errors':<28} {errors}")
+    print(
+        f"{'app process':<28} {cpu_used / max(1, args.calls) * 1000:.1f} ms CPU/call "
+        f"({cpu_used / wall * 100:.0f}% of a core), RSS {rss_before:.0f} -> {rss_after:.0f} MB "
+        f"({(rss_after - rss_before) / max(1, args.concurrency) * 1024:.0f} KB per concurrent call)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
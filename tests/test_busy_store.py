@@ -0,0 +1,47 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytz
+
+from app.busy_store import BusyIntervalStore
+from benchmarks.fake_calendar import FakeCalendarBackend
+
+
+def test_fallback_reads_share_one_freebusy_query():
+    backend = FakeCalendarBackend()
+    start = datetime.now(pytz.UTC) + timedelta(days=90)  # past the synced window
+    end = start + timedelta(hours=6)
+    backend.state.add_event("court-2", start + timedelta(hours=1), start + timedelta(hours=2))
+    store = BusyIntervalStore(backend=backend, window_days=30)
+    calendar_ids = ["facility", "court-1", "court-2"]
+
+    async def read():
+        await store.busy_events_for(calendar_ids, start, end)  # first read syncs each calendar
+        before = backend.state.requests
+        busy = await store.busy_events_for(calendar_ids, start, end)
+        return busy, backend.state.requests - before
+
+    busy, requests = asyncio.run(read())
+
+    assert requests == 1
+    assert busy["facility"] == busy["court-1"] == []
+    # Free/busy carries no event ids.
+    assert busy["court-2"] == [(None, (start + timedelta(hours=1), start + timedelta(hours=2)))]
+
+
+def test_reads_inside_the_window_come_from_memory():
+    backend = FakeCalendarBackend()
+    start = datetime.now(pytz.UTC).replace(microsecond=0) + timedelta(days=1)
+    event_id = backend.state.add_event("court-1", start, start + timedelta(hours=1))
+    store = BusyIntervalStore(backend=backend, window_days=30)
+
+    async def read():
+        await store.busy_events_for(["facility", "court-1"], start, start + timedelta(hours=6))
+        before = backend.state.requests
+        busy = await store.busy_events_for(["facility", "court-1"], start, start + timedelta(hours=6))
+        return busy, backend.state.requests - before
+
+    busy, requests = asyncio.run(read())
+
+    assert requests == 0
+    assert busy == {"facility": [], "court-1": [(event_id, (start, start + timedelta(hours=1)))]}
@@ -0,0 +1,153 @@
+"""Many concurrent calls share a small connection pool through the tool dispatch.
+
+Runs against a file-backed SQLite database with a ``QueuePool``, so no
+Postgres is needed (only ``aiosqlite``): the facility comes from the cache
+and each ``check_availability`` tool call queries ``bookings``.
+"""
+import asyncio
+import json
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.ai import realtime_client
+from app.booking_service import FacilityWithConfig, _facility_cache
+from app.busy_store import busy_store
+from app.calendar_client import EventPage
+from app.models import Facility, FacilityConfig
+
+pytest.importorskip("aiosqlite")
+
+CALLS = 200
+TOOLS_PER_CALL = 3
+POOL_SIZE = 3
+MAX_OVERFLOW = 2
+
+BOOKINGS_DDL = """
+CREATE TABLE bookings (
+    id CHAR(32) PRIMARY KEY,
+    facility_id CHAR(32) NOT NULL,
+    court_id CHAR(32),
+    customer_id CHAR(32) NOT NULL,
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP NOT NULL,
+    status VARCHAR NOT NULL,
+    google_event_id VARCHAR,
+    price NUMERIC,
+    source VARCHAR NOT NULL,
+    created_at TIMESTAMP NOT NULL
+)
+"""
+
+
+class EmptyCalendar:
+    async def list_events(self, calendar_id, sync_token=None, time_min=None, time_max=None):
+        return EventPage(events=[], next_sync_token="sync")
+
+    async def freebusy(self, calendar_ids, time_min, time_max):
+        return {calendar_id: [] for calendar_id in calendar_ids}
+
+
+class FakeRealtimeSocket:
+    """Sends a call's tool calls, then stays open until every result has come back."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.results = []
+        self._done = asyncio.Event()
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for message in self.messages:
+            yield message
+            await asyncio.sleep(0)
+        await self._done.wait()
+
+    async def send(self, message, text=False):
+        self.results.append(json.loads(message))
+        if len(self.results) == len(self.messages):
+            self._done.set()
+
+    async def close(self):
+        pass
+
+
+def test_concurrent_calls_never_exceed_the_pool(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'calls.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=30,
+    )
+    checked_out = peak = 0
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _checkout(*_):
+        nonlocal checked_out, peak
+        checked_out += 1
+        peak = max(peak, checked_out)
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _checkin(*_):
+        nonlocal checked_out
+        checked_out -= 1
+
+    monkeypatch.setattr(realtime_client, "SessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+    monkeypatch.setattr(busy_store, "_backend", EmptyCalendar())
+
+    facility = Facility(id=uuid.uuid4(), name="Pool Test", phone_number="+pool-test", timezone="Asia/Kolkata")
+    config = FacilityConfig(
+        facility_id=facility.id,
+        open_hours={day: ["06:00-22:00"] for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")},
+        slot_minutes=60,
+        max_courts=4,
+        google_calendar_mode="single_calendar",
+    )
+    _facility_cache.set(facility.id, FacilityWithConfig(facility=facility, config=config))
+
+    async def call(idx):
+        messages = [
+            json.dumps(
+                {
+                    "type": "tool_call",
+                    "id": f"call-{idx}-{n}",
+                    "name": "check_availability",
+                    "arguments": {"date": (date.today() + timedelta(days=1 + (idx + n) % 7)).isoformat()},
+                }
+            )
+            for n in range(TOOLS_PER_CALL)
+        ]
+        client = realtime_client.RealtimeClient(facility, config)
+        client.ws = FakeRealtimeSocket(messages)
+        await client.listen()
+        await client.close()
+        return client.ws.results
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.execute(text(BOOKINGS_DDL))
+        try:
+            return await asyncio.gather(*(call(idx) for idx in range(CALLS)))
+        finally:
+            await engine.dispose()
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        _facility_cache.invalidate(facility.id)
+        busy_store.invalidate()
+
+    assert len(results) == CALLS
+    for call_results in results:
+        assert len(call_results) == TOOLS_PER_CALL
+        for result in call_results:
+            assert isinstance(result["result"], list) and result["result"], result
+    assert 1 < peak <= POOL_SIZE + MAX_OVERFLOW
+    assert checked_out == 0
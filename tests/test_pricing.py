@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pytest
+
+from app.pricing import compile_pricing
+
+RULES = {
+    "base_rate": 600,
+    "weekend_rate": 800,
+    "peak": [{"days": ["fri"], "hours": "22:00-02:00", "rate": 1200}],
+}
+
+
+def local(day: int, hour: int, minute: int = 0) -> datetime:
+    # June 2024: the 7th is a Friday, the 8th a Saturday.
+    return datetime(2024, 6, day, hour, minute)
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        (local(7, 22), local(7, 23), 1200),  # before midnight
+        (local(8, 0), local(8, 1), 1200),  # spilled into Saturday
+        (local(8, 1, 30), local(8, 2, 30), 1000),  # half peak, half weekend rate
+        (local(8, 2), local(8, 3), 800),  # after the window
+        (local(7, 23), local(8, 1), 2400),  # across midnight
+        (local(6, 0), local(6, 1), 600),  # the window starts on Friday, not Thursday night
+    ],
+)
+def test_overnight_peak_window_continues_into_next_day(start, end, expected):
+    assert compile_pricing(RULES).price(start, end) == expected
+
+
+def test_window_ending_at_midnight_stays_on_its_day():
+    table = compile_pricing({"base_rate": 600, "peak": [{"hours": "22:00-00:00", "rate": 1200}]})
+    assert table.price(local(7, 23), local(8, 0)) == 1200
+    assert table.price(local(8, 0), local(8, 1)) == 600
+
+
+def test_sunday_overnight_window_wraps_to_monday():
+    table = compile_pricing({"base_rate": 600, "peak": [{"days": ["sun"], "hours": "23:00-01:00", "rate": 1200}]})
+    assert table.price(datetime(2024, 6, 10, 0), datetime(2024, 6, 10, 1)) == 1200
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from websockets.protocol import State
+
+from app.ai.realtime_pool import RealtimeSessionPool
+
+
+class FakeSession:
+    state = State.OPEN
+
+    async def close(self):
+        self.state = State.CLOSED
+
+
+def test_session_is_not_handed_out_without_room_for_a_full_call():
+    now = 0.0
+    opened = []
+
+    async def opener():
+        opened.append(FakeSession())
+        return opened[-1]
+
+    pool = RealtimeSessionPool(
+        min_size=1,
+        max_size=1,
+        horizon_seconds=30,
+        max_idle_seconds=600,
+        health_interval=15,
+        session_max_seconds=1800,
+        max_call_seconds=1500,
+        opener=opener,
+        clock=lambda: now,
+    )
+
+    async def run():
+        nonlocal now
+        await pool.maintain()  # warm session opened at 0
+        now = 299.0
+        fresh = await pool.acquire()  # 1500 s call still ends before 1800 s
+        await pool.maintain()  # warm session opened at 299
+        now = 599.0
+        stale = await pool.acquire()  # idle well under 600 s, but only 1501 s of session left
+        await asyncio.gather(*pool._closing)
+        return fresh, stale
+
+    fresh, stale = asyncio.run(run())
+
+    assert fresh is opened[0] and pool.stats.hits == 1
+    assert stale is opened[-1] and pool.stats.recycled == 1 and pool.stats.misses == 1
+
+
+def test_call_longer_than_the_session_is_rejected():
+    with pytest.raises(ValueError):
+        RealtimeSessionPool(
+            min_size=0,
+            max_size=1,
+            horizon_seconds=30,
+            max_idle_seconds=600,
+            health_interval=15,
+            session_max_seconds=1800,
+            max_call_seconds=1800,
+        )
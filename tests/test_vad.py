@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from app.telephony.audio import PCM16_TO_ULAW
+from app.telephony.vad import SilenceSuppressor
+
+RATE = 8000
+FRAME_SAMPLES = 160
+
+
+def to_frames(pcm: np.ndarray) -> list:
+    ulaw = PCM16_TO_ULAW[np.clip(pcm, -32768, 32767).astype(np.int16).view(np.uint16)].tobytes()
+    return [ulaw[i : i + FRAME_SAMPLES] for i in range(0, len(ulaw) - FRAME_SAMPLES + 1, FRAME_SAMPLES)]
+
+
+def noise(amplitude: float, seconds: float, seed: int = 1) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0, amplitude, int(seconds * RATE))
+
+
+def speech(seconds: float) -> np.ndarray:
+    """Syllable-length voiced bursts, as in benchmarks.load_test."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    envelope = (np.sin(2 * np.pi * 3 * t) > -0.3).astype(np.float64)
+    voiced = np.sin(2 * np.pi * 140 * t) + 0.5 * np.sin(2 * np.pi * 280 * t) + 0.3 * np.sin(2 * np.pi * 700 * t)
+    return 6000 * envelope * voiced
+
+
+def forwarded(vad: SilenceSuppressor, frames: list) -> int:
+    return sum(len(vad.process(frame)) for frame in frames)
+
+
+@pytest.mark.parametrize("amplitude", [30, 100, 300, 1000])
+def test_stationary_noise_is_suppressed(amplitude):
+    vad = SilenceSuppressor()
+    forwarded(vad, to_frames(noise(amplitude, 10.0)))
+    assert vad.stats.suppressed_fraction > 0.8
+
+
+@pytest.mark.parametrize("amplitude", [30, 300])
+def test_speech_over_noise_is_forwarded(amplitude):
+    vad = SilenceSuppressor()
+    forwarded(vad, to_frames(noise(amplitude, 5.0)))
+    frames = to_frames(speech(5.0) + noise(amplitude, 5.0, seed=2))
+    assert forwarded(vad, frames) >= 0.95 * len(frames)
+
+
+def test_noise_after_speech_is_suppressed_again():
+    vad = SilenceSuppressor()
+    forwarded(vad, to_frames(speech(5.0) + noise(300, 5.0)))
+    tail = to_frames(noise(300, 5.0, seed=3))
+    assert forwarded(vad, tail) < 0.3 * len(tail)